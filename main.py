@@ -4,17 +4,35 @@ Donkey Kong Classic Game
 Punto de entrada principal del juego
 """
 
-import pygame
+# Primero el temporizador, para que el informe de arranque incluya las importaciones
+from src.utils.startup import startup_timer
+
+import argparse
 import sys
-from src.game.game_manager import GameManager
-from src.utils.config import Config
+
+with startup_timer.phase("importar pygame"):
+    import pygame
 
 def main():
     """Función principal del juego"""
-    pygame.init()
+    parser = argparse.ArgumentParser(description="Donkey Kong Classic")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="imprime el tiempo de cada etapa del arranque hasta el primer frame")
+    args = parser.parse_args()
+    startup_timer.enabled = args.startup_report
+    
+    with startup_timer.phase("importar el juego"):
+        from src.game.game_manager import GameManager
+        from src.utils.config import Config
+    
+    # Solo lo que necesita el primer frame; el mezclador lo inicia el hilo de SoundManager
+    with startup_timer.phase("pygame.init"):
+        pygame.display.init()
+        pygame.font.init()
     
     try:
-        config = Config()
+        with startup_timer.phase("configuración"):
+            config = Config()
         game = GameManager(config)
         game.run()
     except Exception as e:
@@ -0,0 +1,127 @@
+"""
+Checkpoints incrementales de tablas Q en formato binario de ancho fijo
+"""
+
+import os
+import queue
+import struct
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    # Sin NumPy (PyInstaller) los checkpoints usan pickle en segundo plano
+    np = None
+
+# Cabecera: magia, versión, tamaño de estado, número de acciones, reservado, epsilon, filas
+HEADER = struct.Struct('<4sHHHHdQ')
+MAGIC = b'QTBL'
+VERSION = 1
+
+def row_dtype(state_size, action_size):
+    """Tipo de fila: clave discretizada (int8) seguida de los valores Q (float32)"""
+    return np.dtype([('key', np.int8, (state_size,)), ('q', np.float32, (action_size,))])
+
+def checkpoint_path_for(model_path):
+    """Ruta del checkpoint binario asociado a un modelo"""
+    return os.path.splitext(model_path)[0] + '.qtbl'
+
+def read_checkpoint(path):
+    """Abre un checkpoint con mmap; retorna (filas, epsilon) o (None, None) si no existe"""
+    if not os.path.exists(path):
+        return None, None
+    
+    with open(path, 'rb') as f:
+        magic, version, state_size, action_size, _, epsilon, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Checkpoint inválido: {path}")
+    
+    dtype = row_dtype(state_size, action_size)
+    if count == 0:
+        return np.zeros(0, dtype=dtype), epsilon
+    rows = np.memmap(path, dtype=dtype, mode='r', offset=HEADER.size, shape=(count,))
+    return rows, epsilon
+
+def write_checkpoint(path, rows, epsilon):
+    """Escribe las filas en un archivo temporal y lo renombra de forma atómica"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    state_size = rows.dtype['key'].shape[0]
+    action_size = rows.dtype['q'].shape[0]
+    
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, state_size, action_size, 0, epsilon, len(rows)))
+        f.write(rows.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def merge_rows(old_rows, new_rows):
+    """Combina filas existentes con filas nuevas; las nuevas reemplazan a las existentes"""
+    if old_rows is None or len(old_rows) == 0:
+        return new_rows
+    if old_rows.dtype != new_rows.dtype:
+        # El formato cambió (otro tamaño de estado/acción): se descarta lo anterior
+        return new_rows
+    
+    combined = np.concatenate([np.asarray(new_rows), np.asarray(old_rows)])
+    key_bytes = np.ascontiguousarray(combined['key']).view(
+        np.dtype((np.void, combined.dtype['key'].itemsize)))
+    # np.unique retorna la primera aparición: las filas nuevas van primero
+    _, first = np.unique(key_bytes.ravel(), return_index=True)
+    return combined[np.sort(first)]
+
+class CheckpointWriter:
+    """Escritor en segundo plano: el hilo del juego solo copia las filas modificadas"""
+    
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self._worker, name="QCheckpointWriter", daemon=True)
+        self.thread.start()
+    
+    def request(self, agent):
+        """Encola un checkpoint incremental del agente (no bloquea)"""
+        if np is None:
+            self.requests.put(('pickle', agent))
+            return True
+        
+        keys, q_values, epsilon = agent.snapshot_dirty_rows()
+        if len(keys) == 0:
+            return False
+        
+        rows = np.zeros(len(keys), dtype=row_dtype(agent.state_size, agent.action_size))
+        rows['key'] = keys
+        rows['q'] = q_values
+        self.requests.put(('rows', agent.checkpoint_path, rows, epsilon))
+        return True
+    
+    def _worker(self):
+        """Combina y escribe los checkpoints pendientes"""
+        while True:
+            job = self.requests.get()
+            try:
+                if job is None:
+                    return
+                if job[0] == 'pickle':
+                    job[1].save_model()
+                    continue
+                _, path, rows, epsilon = job
+                old_rows, _ = read_checkpoint(path)
+                merged = merge_rows(old_rows, rows)
+                del old_rows  # Liberar el mmap antes de reemplazar el archivo
+                write_checkpoint(path, merged, epsilon)
+                print(f"Checkpoint Q-Learning guardado: {len(rows)} filas nuevas, {len(merged)} en total")
+            except Exception as e:
+                print(f"Error al guardar checkpoint: {e}")
+            finally:
+                self.requests.task_done()
+    
+    def flush(self):
+        """Espera a que se escriban los checkpoints pendientes"""
+        self.requests.join()
+    
+    def close(self, timeout=5.0):
+        """Termina el hilo tras escribir lo pendiente"""
+        if self.thread.is_alive():
+            self.requests.put(None)
+            self.thread.join(timeout)
@@ -0,0 +1,398 @@
+"""
+Grafo de navegación precalculado sobre la superficie de las plataformas
+"""
+
+import heapq
+import math
+import time
+import itertools
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from src.utils.platform_index import PlatformIndex
+
+# Tipos de arista
+WALK = 0
+JUMP = 1
+DROP = 2
+
+# Identificadores únicos de grafo (nivel) para las claves de caché
+_graph_ids = itertools.count(1)
+
+class NavigationGraph:
+    """Nodos sobre las plataformas con aristas de caminar, saltar y caer en arrays compactos"""
+    
+    def __init__(self, platforms, node_spacing=80, edge_margin=12,
+                 max_jump_height=140, max_jump_distance=120, jump_penalty=40):
+        self.platforms = list(platforms)
+        self.node_spacing = node_spacing
+        self.edge_margin = edge_margin
+        self.max_jump_height = max_jump_height
+        self.max_jump_distance = max_jump_distance
+        self.jump_penalty = jump_penalty
+        self.graph_id = next(_graph_ids)
+        self.platform_index = PlatformIndex(self.platforms)
+        self.build()
+    
+    def build(self):
+        """Construye nodos y aristas (formato CSR) a partir de las plataformas"""
+        # Nodos: contiguos por plataforma y ordenados por x
+        self.node_x = array('i')
+        self.node_y = array('i')
+        self.node_platform = array('i')
+        self.platform_first = array('i')
+        for index, platform in enumerate(self.platforms):
+            self.platform_first.append(len(self.node_x))
+            for x in self.surface_xs(platform):
+                self.node_x.append(x)
+                self.node_y.append(platform.top)
+                self.node_platform.append(index)
+        self.platform_first.append(len(self.node_x))
+        
+        adjacency = [[] for _ in range(len(self.node_x))]
+        for index, platform in enumerate(self.platforms):
+            first, last = self.platform_first[index], self.platform_first[index + 1] - 1
+            if first > last:
+                continue
+            
+            # Caminar entre nodos vecinos de la misma plataforma
+            for node in range(first, last):
+                cost = self.node_x[node + 1] - self.node_x[node]
+                adjacency[node].append((node + 1, cost, WALK))
+                adjacency[node + 1].append((node, cost, WALK))
+            
+            # Caer por ambos bordes hasta la plataforma inferior
+            for node, x_out in ((first, platform.left - self.edge_margin),
+                                (last, platform.right + self.edge_margin)):
+                below = self.platform_below(x_out, platform.top)
+                if below is not None:
+                    target = self.nearest_node_on_platform(below, x_out)
+                    dx = abs(self.node_x[target] - self.node_x[node])
+                    dy = self.node_y[target] - self.node_y[node]
+                    adjacency[node].append((target, dx + dy * 0.5, DROP))
+            
+            # Saltar a plataformas más altas (o a la misma altura) al alcance
+            for other_index, other in enumerate(self.platforms):
+                rise = platform.top - other.top
+                if other_index == index or rise < 0 or rise > self.max_jump_height:
+                    continue
+                for node in range(first, last + 1):
+                    target = self.nearest_node_on_platform(other_index, self.node_x[node])
+                    if target is None:
+                        continue
+                    dx = abs(self.node_x[target] - self.node_x[node])
+                    if dx <= self.max_jump_distance:
+                        adjacency[node].append((target, math.hypot(dx, rise) + self.jump_penalty, JUMP))
+        
+        # Aristas en formato CSR
+        self.edge_offsets = array('i', [0])
+        self.edge_targets = array('i')
+        self.edge_costs = array('f')
+        self.edge_types = array('b')
+        for edges in adjacency:
+            for target, cost, edge_type in edges:
+                self.edge_targets.append(target)
+                self.edge_costs.append(cost)
+                self.edge_types.append(edge_type)
+            self.edge_offsets.append(len(self.edge_targets))
+        
+        # Aristas invertidas para calcular distancias hacia un objetivo
+        reverse = [[] for _ in range(len(self.node_x))]
+        for node, edges in enumerate(adjacency):
+            for target, cost, _ in edges:
+                reverse[target].append((node, cost))
+        self.reverse_offsets = array('i', [0])
+        self.reverse_sources = array('i')
+        self.reverse_costs = array('f')
+        for edges in reverse:
+            for source, cost in edges:
+                self.reverse_sources.append(source)
+                self.reverse_costs.append(cost)
+            self.reverse_offsets.append(len(self.reverse_sources))
+    
+    def surface_xs(self, platform):
+        """Posiciones x de los nodos sobre una plataforma"""
+        left = platform.left + self.edge_margin
+        right = platform.right - self.edge_margin
+        if right <= left:
+            return [platform.centerx]
+        count = max(1, math.ceil((right - left) / self.node_spacing))
+        return [int(left + i * (right - left) / count) for i in range(count + 1)]
+    
+    def platform_below(self, x, y):
+        """Índice de la primera plataforma bajo (x, y) o None"""
+        return self.platform_index.below_position(x, math.floor(y) + 1)
+    
+    def platform_at(self, x, y, tolerance=20):
+        """Índice de la plataforma sobre la que está un punto (pies del enemigo) o None"""
+        return self.platform_below(x, y - tolerance - 1)
+    
+    def nearest_node_on_platform(self, platform_index, x):
+        """Nodo más cercano a x dentro de una plataforma"""
+        first, end = self.platform_first[platform_index], self.platform_first[platform_index + 1]
+        if first == end:
+            return None
+        position = bisect_left(self.node_x, x, first, end)
+        if position == end:
+            return end - 1
+        if position > first and x - self.node_x[position - 1] < self.node_x[position] - x:
+            return position - 1
+        return position
+    
+    def nearest_node(self, x, y):
+        """Nodo más cercano a un punto, preferentemente en la plataforma bajo él"""
+        platform_index = self.platform_at(x, y)
+        if platform_index is not None:
+            node = self.nearest_node_on_platform(platform_index, x)
+            if node is not None:
+                return node
+        if not self.node_x:
+            return None
+        return min(range(len(self.node_x)),
+                   key=lambda n: (self.node_x[n] - x) ** 2 + (self.node_y[n] - y) ** 2)
+    
+    def neighbors(self, node):
+        """Itera (destino, coste, tipo) de las aristas de un nodo"""
+        for edge in range(self.edge_offsets[node], self.edge_offsets[node + 1]):
+            yield self.edge_targets[edge], self.edge_costs[edge], self.edge_types[edge]
+    
+    def edge_type(self, node, target):
+        """Tipo de la arista entre dos nodos o None"""
+        for neighbor, _, edge_type in self.neighbors(node):
+            if neighbor == target:
+                return edge_type
+        return None
+    
+    def find_node_path(self, start, goal):
+        """A* sobre los nodos; retorna la lista de nodos sin incluir el inicial"""
+        search = IncrementalSearch(self, start, goal)
+        search.step(math.inf)
+        return search.path
+    
+    def node_positions(self, nodes):
+        """Convierte una lista de nodos en posiciones (x, y)"""
+        return [(self.node_x[node], self.node_y[node]) for node in nodes]
+    
+    def find_path(self, start_pos, target_pos):
+        """Camino entre dos puntos como lista de posiciones (x, y) sobre las plataformas"""
+        start = self.nearest_node(*start_pos)
+        goal = self.nearest_node(*target_pos)
+        return self.node_positions(self.find_node_path(start, goal))
+    
+    def get_stats(self):
+        """Obtiene estadísticas del grafo"""
+        return {
+            'nodes': len(self.node_x),
+            'edges': len(self.edge_targets)
+        }
+
+class IncrementalSearch:
+    """Búsqueda A* reanudable: avanza un número limitado de expansiones por llamada"""
+    
+    def __init__(self, graph, start, goal):
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.path = []
+        self.came_from = {}
+        self.g_score = {start: 0}
+        self.expanded = 0
+        self.done = start is None or goal is None or start == goal
+        # Ninguna arista cuesta menos que su desplazamiento horizontal
+        self.goal_x = graph.node_x[goal] if goal is not None else 0
+        self.open_set = [] if self.done else [(abs(graph.node_x[start] - self.goal_x), start)]
+    
+    def step(self, max_expansions):
+        """Expande hasta max_expansions nodos; retorna cuántos expandió"""
+        graph = self.graph
+        expanded = 0
+        while self.open_set and not self.done and expanded < max_expansions:
+            _, current = heapq.heappop(self.open_set)
+            expanded += 1
+            if current == self.goal:
+                path = []
+                while current in self.came_from:
+                    path.append(current)
+                    current = self.came_from[current]
+                self.path = path[::-1]
+                self.done = True
+                break
+            
+            current_g = self.g_score[current]
+            for neighbor, cost, _ in graph.neighbors(current):
+                tentative_g = current_g + cost
+                if tentative_g < self.g_score.get(neighbor, math.inf):
+                    self.came_from[neighbor] = current
+                    self.g_score[neighbor] = tentative_g
+                    heapq.heappush(self.open_set, (tentative_g + abs(graph.node_x[neighbor] - self.goal_x), neighbor))
+        
+        if not self.open_set:
+            # Sin camino
+            self.done = True
+        self.expanded += expanded
+        return expanded
+
+class FlowField:
+    """Mapa de Dijkstra hacia un objetivo: cada nodo conoce su siguiente paso"""
+    
+    def __init__(self, graph):
+        self.graph = graph
+        self.goal = None
+        node_count = len(graph.node_x)
+        self.distance = array('f', [math.inf]) * node_count
+        self.next_node = array('i', [-1]) * node_count
+        self.recomputes = 0
+    
+    def update(self, target_pos):
+        """Recalcula el campo solo si el objetivo cambió de nodo; retorna True si se recalculó"""
+        goal = self.graph.nearest_node(*target_pos)
+        if goal == self.goal:
+            return False
+        self.goal = goal
+        self.compute(goal)
+        return True
+    
+    def compute(self, goal):
+        """Dijkstra desde el objetivo sobre las aristas invertidas"""
+        graph = self.graph
+        distance = self.distance
+        next_node = self.next_node
+        for node in range(len(distance)):
+            distance[node] = math.inf
+            next_node[node] = -1
+        self.recomputes += 1
+        if goal is None:
+            return
+        
+        distance[goal] = 0.0
+        open_set = [(0.0, goal)]
+        while open_set:
+            current_distance, current = heapq.heappop(open_set)
+            if current_distance > distance[current]:
+                continue
+            for edge in range(graph.reverse_offsets[current], graph.reverse_offsets[current + 1]):
+                source = graph.reverse_sources[edge]
+                new_distance = current_distance + graph.reverse_costs[edge]
+                if new_distance < distance[source]:
+                    distance[source] = new_distance
+                    next_node[source] = current
+                    heapq.heappush(open_set, (new_distance, source))
+    
+    def next_step_node(self, node):
+        """Siguiente nodo hacia el objetivo o None si no hay camino"""
+        if node is None or node == self.goal:
+            return None
+        step = self.next_node[node]
+        return step if step >= 0 else None
+    
+    def next_step(self, position):
+        """Siguiente posición (x, y) hacia el objetivo desde un punto"""
+        step = self.next_step_node(self.graph.nearest_node(*position))
+        if step is None:
+            return None
+        return self.graph.node_x[step], self.graph.node_y[step]
+    
+    def distance_from(self, position):
+        """Coste restante hasta el objetivo desde un punto"""
+        node = self.graph.nearest_node(*position)
+        return self.distance[node] if node is not None else math.inf
+
+class PathCache:
+    """Caché LRU de caminos por (nodo inicial, nodo objetivo, nivel)"""
+    
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, graph, start, goal):
+        """Camino en caché entre dos nodos o None"""
+        key = (start, goal, graph.graph_id)
+        path = self.paths.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.paths.move_to_end(key)
+        self.hits += 1
+        return list(path)
+    
+    def put(self, graph, start, goal, path):
+        """Guarda un camino (lista de posiciones) entre dos nodos"""
+        self.paths[(start, goal, graph.graph_id)] = tuple(path)
+        if len(self.paths) > self.capacity:
+            self.paths.popitem(last=False)
+    
+    def find_path(self, graph, start_pos, target_pos):
+        """Camino entre dos puntos reutilizando resultados previos"""
+        start = graph.nearest_node(*start_pos)
+        goal = graph.nearest_node(*target_pos)
+        path = self.get(graph, start, goal)
+        if path is None:
+            path = graph.node_positions(graph.find_node_path(start, goal))
+            self.put(graph, start, goal, path)
+        return path
+    
+    def clear(self):
+        """Vacía la caché"""
+        self.paths.clear()
+    
+    def get_stats(self):
+        """Obtiene estadísticas de la caché"""
+        return {
+            'size': len(self.paths),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+# Caché compartida por todos los buscadores de caminos
+shared_path_cache = PathCache()
+
+class PathScheduler:
+    """Reparte un presupuesto de expansiones por frame entre las búsquedas pendientes"""
+    
+    def __init__(self, max_expansions=300, max_time=0.002, slice_size=16, path_cache=None):
+        self.max_expansions = max_expansions
+        self.max_time = max_time
+        self.slice_size = slice_size
+        self.path_cache = path_cache or shared_path_cache
+        self.pending = OrderedDict()
+    
+    def request(self, owner, graph, start, goal):
+        """Pide un camino; retorna la ruta si está en caché o None si queda pendiente"""
+        path = self.path_cache.get(graph, start, goal)
+        if path is not None:
+            self.pending.pop(owner, None)
+            return path
+        
+        search = self.pending.get(owner)
+        if search is None or search.graph is not graph or search.start != start or search.goal != goal:
+            # Una nueva petición reemplaza a la anterior del mismo dueño
+            self.pending[owner] = IncrementalSearch(graph, start, goal)
+        return None
+    
+    def cancel(self, owner):
+        """Descarta la búsqueda pendiente de un dueño"""
+        self.pending.pop(owner, None)
+    
+    def clear(self):
+        """Descarta todas las búsquedas pendientes"""
+        self.pending.clear()
+    
+    def run(self):
+        """Avanza las búsquedas en turnos; retorna [(dueño, ruta, nodo objetivo)] terminadas"""
+        finished = []
+        budget = self.max_expansions
+        deadline = time.perf_counter() + self.max_time
+        while self.pending and budget > 0 and time.perf_counter() < deadline:
+            owner, search = next(iter(self.pending.items()))
+            budget -= max(1, search.step(min(budget, self.slice_size)))
+            if search.done:
+                del self.pending[owner]
+                path = search.graph.node_positions(search.path)
+                self.path_cache.put(search.graph, search.start, search.goal, path)
+                finished.append((owner, path, search.goal))
+            else:
+                # Turno rotativo para que ninguna búsqueda acapare el presupuesto
+                self.pending.move_to_end(owner)
+        return finished
@@ -4,6 +4,7 @@ Algoritmo A* para pathfinding de enemigos
 
 import heapq
 import math
+from src.ai.navigation import shared_path_cache
 
 class AStarPathfinder:
     def __init__(self, grid_width, grid_height, cell_size=20):
@@ -11,6 +12,11 @@ class AStarPathfinder:
         self.grid_height = grid_height // cell_size
         self.cell_size = cell_size
         self.obstacles = set()
+        self.navigation_graph = None
+    
+    def set_navigation_graph(self, navigation_graph):
+        """Usa el grafo de navegación precalculado del nivel en lugar de la rejilla"""
+        self.navigation_graph = navigation_graph
     
     def add_obstacles(self, platforms):
         """Agrega obstáculos basados en las plataformas (solo el interior, no la superficie)"""
@@ -49,6 +55,9 @@ class AStarPathfinder:
     
     def find_path(self, start_pos, target_pos):
         """Encuentra el camino más corto usando A*"""
+        if self.navigation_graph:
+            return shared_path_cache.find_path(self.navigation_graph, start_pos, target_pos)
+        
         start = (start_pos[0] // self.cell_size, start_pos[1] // self.cell_size)
         goal = (target_pos[0] // self.cell_size, target_pos[1] // self.cell_size)
         
@@ -11,9 +11,21 @@ except ImportError:
 import random
 import pickle
 import os
+import math
+import threading
+from src.ai.checkpoint import checkpoint_path_for, read_checkpoint
+
+DEFAULT_MODEL_PATH = "data/models/q_learning_model.pkl"
+
+# La tabla densa necesita NumPy real (el reemplazo de PyInstaller no tiene ndarray)
+HAS_NUMPY = hasattr(np, 'ndarray')
+
+# Cada característica normalizada se discretiza en int(s * 10) -> 0..10
+STATE_LEVELS = 11
 
 class QLearningAgent:
-    def __init__(self, state_size, action_size, learning_rate=0.1, discount_factor=0.95, epsilon=0.1):
+    def __init__(self, state_size, action_size, learning_rate=0.1, discount_factor=0.95, epsilon=0.1,
+                 model_path=DEFAULT_MODEL_PATH, dense=False, state_bins=None):
         self.state_size = state_size
         self.action_size = action_size
         self.learning_rate = learning_rate
@@ -23,83 +35,361 @@ class QLearningAgent:
         # Tabla Q inicializada con ceros
         self.q_table = {}
         
+        # Estados modificados desde el último checkpoint (modo diccionario)
+        self.dirty_keys = set()
+        
+        # Tabla Q densa opcional (ndarray indexado por id de estado empaquetado)
+        self.dense = dense and HAS_NUMPY
+        if dense and not HAS_NUMPY:
+            print("NumPy no disponible, usando tabla Q con diccionario")
+        if self.dense:
+            self.init_dense_table(state_bins)
+        
+        # Candado para actualizaciones concurrentes (agente compartido)
+        self.lock = threading.RLock()
+        
         # Cargar modelo existente si existe
-        self.model_path = "data/models/q_learning_model.pkl"
+        self.model_path = model_path
+        self.checkpoint_path = checkpoint_path_for(model_path)
         self.load_model()
     
+    def init_dense_table(self, state_bins=None):
+        """Crea la tabla Q densa y los pasos para empaquetar estados"""
+        # Niveles por característica; menos de 11 agrupa los valores discretizados
+        self.state_bins = np.array(state_bins or [STATE_LEVELS] * self.state_size, dtype=np.int64)
+        self.state_strides = np.ones(self.state_size, dtype=np.int64)
+        for i in range(self.state_size - 2, -1, -1):
+            self.state_strides[i] = self.state_strides[i + 1] * self.state_bins[i + 1]
+        self.num_states = int(np.prod(self.state_bins))
+        self.q_array = np.zeros((self.num_states, self.action_size), dtype=np.float32)
+        self.visited = np.zeros(self.num_states, dtype=bool)
+        self.dirty = np.zeros(self.num_states, dtype=bool)
+        # Visitas por par estado-acción (peso al combinar tablas de varios procesos)
+        self.visit_counts = np.zeros((self.num_states, self.action_size), dtype=np.int64)
+    
     def get_state_key(self, state):
         """Convierte el estado en una clave para la tabla Q"""
         # Discretizar el estado para usar como clave
         discretized = tuple(int(s * 10) for s in state)
         return discretized
     
+    def get_state_ids(self, states):
+        """Empaqueta varios estados en ids de la tabla densa"""
+        keys = (np.asarray(states, dtype=np.float64) * 10).astype(np.int64)
+        return self.keys_to_ids(keys)
+    
+    def keys_to_ids(self, keys):
+        """Convierte claves discretizadas (0..10) en ids de la tabla densa"""
+        keys = np.clip(keys, 0, STATE_LEVELS - 1)
+        bins = keys * (self.state_bins - 1) // (STATE_LEVELS - 1)
+        return bins @ self.state_strides
+    
+    def ids_to_keys(self, ids):
+        """Reconstruye las claves discretizadas a partir de ids de la tabla densa"""
+        bins = (np.asarray(ids, dtype=np.int64)[:, None] // self.state_strides) % self.state_bins
+        return bins * (STATE_LEVELS - 1) // (self.state_bins - 1)
+    
     def choose_action(self, state):
         """Elige una acción usando epsilon-greedy"""
+        if self.dense:
+            return self.choose_actions([state])[0]
+        
         state_key = self.get_state_key(state)
         
         # Exploración vs explotación
         if random.random() < self.epsilon:
             return random.randint(0, self.action_size - 1)
         
-        # Si el estado no existe en la tabla, inicializarlo
-        if state_key not in self.q_table:
-            self.q_table[state_key] = [0.0] * self.action_size
+        with self.lock:
+            # Si el estado no existe en la tabla, inicializarlo
+            if state_key not in self.q_table:
+                self.q_table[state_key] = [0.0] * self.action_size
+                self.dirty_keys.add(state_key)
+            
+            # Elegir la mejor acción
+            q_values = self.q_table[state_key]
+            return q_values.index(max(q_values))
+    
+    def choose_actions(self, states):
+        """Elige acciones epsilon-greedy para varios estados a la vez"""
+        if not self.dense:
+            return [self.choose_action(state) for state in states]
+        if len(states) == 0:
+            return []
+        
+        ids = self.get_state_ids(states)
+        with self.lock:
+            self.visited[ids] = True
+            self.dirty[ids] = True
+            actions = np.argmax(self.q_array[ids], axis=1)
         
-        # Elegir la mejor acción
-        q_values = self.q_table[state_key]
-        return q_values.index(max(q_values))
+        # Exploración vs explotación
+        explore = np.random.random(len(ids)) < self.epsilon
+        if explore.any():
+            actions[explore] = np.random.randint(0, self.action_size, int(explore.sum()))
+        return actions.tolist()
     
     def learn(self, state, action, reward, next_state, done):
         """Actualiza la tabla Q usando la ecuación de Bellman"""
+        if self.dense:
+            self.learn_batch([state], [action], [reward], [next_state], [done])
+            return
+        
         state_key = self.get_state_key(state)
         next_state_key = self.get_state_key(next_state)
         
-        # Inicializar estados si no existen
-        if state_key not in self.q_table:
-            self.q_table[state_key] = [0.0] * self.action_size
-        if next_state_key not in self.q_table:
-            self.q_table[next_state_key] = [0.0] * self.action_size
+        with self.lock:
+            # Inicializar estados si no existen
+            if state_key not in self.q_table:
+                self.q_table[state_key] = [0.0] * self.action_size
+            if next_state_key not in self.q_table:
+                self.q_table[next_state_key] = [0.0] * self.action_size
+                self.dirty_keys.add(next_state_key)
+            
+            # Ecuación de Bellman
+            current_q = self.q_table[state_key][action]
+            max_next_q = max(self.q_table[next_state_key]) if not done else 0
+            
+            new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
+            self.q_table[state_key][action] = new_q
+            self.dirty_keys.add(state_key)
+            
+            # Decaimiento de epsilon
+            if self.epsilon > 0.01:
+                self.epsilon *= 0.9995
+    
+    def learn_batch(self, states, actions, rewards, next_states, dones):
+        """Actualiza la tabla Q con varias experiencias a la vez"""
+        if not self.dense:
+            for experience in zip(states, actions, rewards, next_states, dones):
+                self.learn(*experience)
+            return
+        if len(states) == 0:
+            return
         
-        # Ecuación de Bellman
-        current_q = self.q_table[state_key][action]
-        max_next_q = max(self.q_table[next_state_key]) if not done else 0
+        ids = self.get_state_ids(states)
+        next_ids = self.get_state_ids(next_states)
+        actions = np.asarray(actions, dtype=np.int64)
+        rewards = np.asarray(rewards, dtype=np.float32)
+        not_done = ~np.asarray(dones, dtype=bool)
         
-        new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
-        self.q_table[state_key][action] = new_q
+        with self.lock:
+            self.visited[ids] = True
+            self.visited[next_ids] = True
+            self.dirty[ids] = True
+            self.dirty[next_ids] = True
+            np.add.at(self.visit_counts, (ids, actions), 1)
+            
+            # Ecuación de Bellman vectorizada (si se repite un par estado-acción gana la última)
+            current_q = self.q_array[ids, actions]
+            max_next_q = self.q_array[next_ids].max(axis=1) * not_done
+            self.q_array[ids, actions] = current_q + self.learning_rate * (
+                rewards + self.discount_factor * max_next_q - current_q)
+            
+            # Decaimiento de epsilon equivalente a una actualización por experiencia
+            if self.epsilon > 0.01:
+                steps_to_floor = math.ceil(math.log(0.01 / self.epsilon) / math.log(0.9995))
+                self.epsilon *= 0.9995 ** min(len(ids), steps_to_floor)
+    
+    def dense_to_dict(self):
+        """Convierte las filas visitadas de la tabla densa al formato de diccionario"""
+        ids = np.flatnonzero(self.visited)
+        keys = self.ids_to_keys(ids)
+        rows = self.q_array[ids].tolist()
+        return {tuple(key): row for key, row in zip(keys.tolist(), rows)}
+    
+    def load_dense_from_dict(self, q_table):
+        """Copia una tabla Q de diccionario a la tabla densa"""
+        self.q_array.fill(0)
+        self.visited.fill(False)
+        if not q_table:
+            return
+        keys = np.array(list(q_table.keys()), dtype=np.int64)
+        ids = self.keys_to_ids(keys)
+        self.q_array[ids] = np.array(list(q_table.values()), dtype=np.float32)
+        self.visited[ids] = True
+    
+    def snapshot_dirty_rows(self):
+        """Copia las filas modificadas desde el último checkpoint y las marca como limpias"""
+        with self.lock:
+            if self.dense:
+                ids = np.flatnonzero(self.dirty)
+                self.dirty[ids] = False
+                return self.ids_to_keys(ids), self.q_array[ids], self.epsilon
+            keys = list(self.dirty_keys)
+            self.dirty_keys.clear()
+            return keys, [list(self.q_table[key]) for key in keys], self.epsilon
+    
+    def mark_all_dirty(self):
+        """Marca toda la tabla para incluirla en el próximo checkpoint"""
+        with self.lock:
+            if self.dense:
+                self.dirty[:] = self.visited
+            else:
+                self.dirty_keys.update(self.q_table.keys())
+    
+    def load_checkpoint(self):
+        """Carga el checkpoint binario con mmap; retorna False si no existe"""
+        rows, epsilon = read_checkpoint(self.checkpoint_path)
+        if rows is None:
+            return False
+        if rows.dtype['key'].shape[0] != self.state_size or rows.dtype['q'].shape[0] != self.action_size:
+            raise ValueError("El checkpoint no coincide con el tamaño del agente")
         
-        # Decaimiento de epsilon
-        if self.epsilon > 0.01:
-            self.epsilon *= 0.9995
+        if self.dense:
+            self.q_array.fill(0)
+            self.visited.fill(False)
+            if len(rows):
+                ids = self.keys_to_ids(rows['key'].astype(np.int64))
+                self.q_array[ids] = rows['q']
+                self.visited[ids] = True
+        else:
+            self.q_table = {tuple(key): q for key, q in zip(rows['key'].tolist(), rows['q'].tolist())}
+        self.epsilon = epsilon
+        return True
+    
+    def export_table(self):
+        """Exporta las filas visitadas de la tabla densa: (ids, valores Q, visitas)"""
+        with self.lock:
+            ids = np.flatnonzero(self.visited)
+            return ids, self.q_array[ids], self.visit_counts[ids]
+    
+    def import_table(self, ids, q_values, epsilon=None):
+        """Reemplaza la tabla densa por las filas dadas y reinicia las visitas"""
+        with self.lock:
+            self.q_array.fill(0)
+            self.visited.fill(False)
+            self.visit_counts.fill(0)
+            self.q_array[ids] = q_values
+            self.visited[ids] = True
+            if epsilon is not None:
+                self.epsilon = epsilon
+    
+    def merge_tables(self, tables):
+        """Combina tablas exportadas promediando cada valor Q según sus visitas"""
+        weighted = np.zeros(self.q_array.shape, dtype=np.float64)
+        total = np.zeros(self.visit_counts.shape, dtype=np.int64)
+        seen = np.zeros(self.num_states, dtype=bool)
+        for ids, q_values, counts in tables:
+            weighted[ids] += q_values * counts
+            total[ids] += counts
+            seen[ids] = True
+        
+        with self.lock:
+            # Los pares que nadie visitó conservan su valor actual
+            updated = total > 0
+            self.q_array[updated] = weighted[updated] / total[updated]
+            self.visit_counts += total
+            self.visited |= seen
+            self.dirty |= seen
     
     def save_model(self):
         """Guarda el modelo entrenado"""
         try:
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-            with open(self.model_path, 'wb') as f:
-                pickle.dump({
-                    'q_table': self.q_table,
+            with self.lock:
+                if self.dense:
+                    q_table = self.dense_to_dict()
+                else:
+                    q_table = {key: list(values) for key, values in self.q_table.items()}
+                data = {
+                    'q_table': q_table,
                     'epsilon': self.epsilon
-                }, f)
+                }
+            with open(self.model_path, 'wb') as f:
+                pickle.dump(data, f)
             print("Modelo Q-Learning guardado")
         except Exception as e:
             print(f"Error al guardar modelo: {e}")
     
+    def checkpoint_is_current(self):
+        """El checkpoint existe y no es más antiguo que el modelo .pkl"""
+        if not os.path.exists(self.checkpoint_path):
+            return False
+        if not os.path.exists(self.model_path):
+            return True
+        return os.path.getmtime(self.checkpoint_path) >= os.path.getmtime(self.model_path)
+    
     def load_model(self):
-        """Carga un modelo previamente entrenado"""
+        """Carga un modelo previamente entrenado (el más reciente entre checkpoint y .pkl)"""
+        if HAS_NUMPY:
+            try:
+                # Preferir el checkpoint binario (mmap, sin deserializar con pickle)
+                if self.checkpoint_is_current():
+                    if self.load_checkpoint():
+                        print("Checkpoint Q-Learning cargado")
+                        return
+                elif os.path.exists(self.checkpoint_path):
+                    # Un .pkl más nuevo (p. ej. un modelo reentrenado) reemplaza al checkpoint de
+                    # partidas anteriores; se borra para que no se combinen sus filas antiguas
+                    os.remove(self.checkpoint_path)
+                    print("Checkpoint Q-Learning antiguo descartado: el modelo .pkl es más reciente")
+            except Exception as e:
+                print(f"Error al cargar checkpoint: {e}")
+        
         try:
             if os.path.exists(self.model_path):
                 with open(self.model_path, 'rb') as f:
                     data = pickle.load(f)
                     self.q_table = data.get('q_table', {})
                     self.epsilon = data.get('epsilon', self.epsilon)
+                if self.dense:
+                    self.load_dense_from_dict(self.q_table)
+                    self.q_table = {}
+                # El primer checkpoint binario debe incluir toda la tabla
+                self.mark_all_dirty()
                 print("Modelo Q-Learning cargado")
         except Exception as e:
             print(f"Error al cargar modelo: {e}")
     
     def get_stats(self):
         """Obtiene estadísticas del modelo"""
-        return {
-            'states_explored': len(self.q_table),
-            'epsilon': self.epsilon,
-            'total_q_values': sum(len(actions) for actions in self.q_table.values())
-        }
\ No newline at end of file
+        with self.lock:
+            if self.dense:
+                states_explored = int(self.visited.sum())
+                return {
+                    'states_explored': states_explored,
+                    'epsilon': self.epsilon,
+                    'total_q_values': states_explored * self.action_size
+                }
+            return {
+                'states_explored': len(self.q_table),
+                'epsilon': self.epsilon,
+                'total_q_values': sum(len(actions) for actions in self.q_table.values())
+            }
+
+
+# Registro de agentes compartidos: una tabla Q por tipo de enemigo
+_shared_agents = {}
+_registry_lock = threading.Lock()
+
+def get_shared_agent(archetype, state_size, action_size, model_path=None, **kwargs):
+    """Obtiene el agente compartido de un tipo de enemigo (se crea y carga una sola vez)"""
+    agent = _shared_agents.get(archetype)
+    if agent is not None:
+        return agent
+    
+    with _registry_lock:
+        # Otro hilo pudo crearlo mientras esperábamos el candado
+        agent = _shared_agents.get(archetype)
+        if agent is None:
+            if model_path is None:
+                model_path = DEFAULT_MODEL_PATH if archetype == "barrel" else f"data/models/q_learning_{archetype}.pkl"
+            agent = QLearningAgent(state_size, action_size, model_path=model_path, **kwargs)
+            _shared_agents[archetype] = agent
+        return agent
+
+def get_shared_agents():
+    """Retorna todos los agentes compartidos registrados"""
+    with _registry_lock:
+        return dict(_shared_agents)
+
+def save_shared_agents():
+    """Guarda los modelos de todos los agentes compartidos"""
+    for agent in get_shared_agents().values():
+        agent.save_model()
+
+def clear_shared_agents():
+    """Elimina los agentes compartidos (se recargarán desde disco al pedirlos)"""
+    with _registry_lock:
+        _shared_agents.clear()
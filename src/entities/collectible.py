@@ -6,20 +6,57 @@ import pygame
 import random
 import math
 
+# Radios exterior e interior de la estrella
+STAR_OUTER_RADIUS = 8
+STAR_INNER_RADIUS = 4
+
+# Desplazamientos verticales del balanceo precalculados para un ciclo completo
+BOB_AMPLITUDE = 5
+BOB_STEPS = 63  # ~2π / 0.1: misma velocidad que el balanceo original
+BOB_OFFSETS = [int(BOB_AMPLITUDE * math.sin(2 * math.pi * i / BOB_STEPS)) for i in range(BOB_STEPS)]
+
+# Superficies de la estrella por color (se dibujan una sola vez)
+_star_surfaces = {}
+
+def get_star_surface(color):
+    """Estrella de cinco puntas pre-renderizada sobre una superficie transparente"""
+    key = tuple(color)
+    surface = _star_surfaces.get(key)
+    if surface is None:
+        size = STAR_OUTER_RADIUS * 2 + 1
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (STAR_OUTER_RADIUS, STAR_OUTER_RADIUS)
+        points = []
+        for i in range(5):
+            angle = i * 144 - 90  # -90 para que apunte hacia arriba
+            outer_x = center[0] + STAR_OUTER_RADIUS * math.cos(math.radians(angle))
+            outer_y = center[1] + STAR_OUTER_RADIUS * math.sin(math.radians(angle))
+            points.append((outer_x, outer_y))
+            
+            angle += 72
+            inner_x = center[0] + STAR_INNER_RADIUS * math.cos(math.radians(angle))
+            inner_y = center[1] + STAR_INNER_RADIUS * math.sin(math.radians(angle))
+            points.append((inner_x, inner_y))
+        
+        pygame.draw.polygon(surface, color, points)
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        _star_surfaces[key] = surface
+    return surface
+
 class Collectible:
     def __init__(self, x, y, config, points=10):
         self.config = config
         self.rect = pygame.Rect(x, y, 15, 15)
         self.points = points
         self.collected = False
-        self.bob_offset = 0
-        self.bob_speed = 0.1
+        self.bob_index = 0
         self.original_y = y
-        
+    
     def update(self):
         """Actualiza la animación del coleccionable"""
-        self.bob_offset += self.bob_speed
-        self.rect.y = self.original_y + int(5 * math.sin(self.bob_offset))
+        self.bob_index = (self.bob_index + 1) % BOB_STEPS
+        self.rect.y = self.original_y + BOB_OFFSETS[self.bob_index]
     
     def collect(self):
         """Marca el objeto como recolectado"""
@@ -29,18 +66,7 @@ class Collectible:
     def render(self, screen):
         """Renderiza el coleccionable"""
         if not self.collected:
-            # Estrella simple
+            # Estrella pre-renderizada centrada en el rect
             center = self.rect.center
-            points = []
-            for i in range(5):
-                angle = i * 144 - 90  # -90 para que apunte hacia arriba
-                outer_x = center[0] + 8 * math.cos(math.radians(angle))
-                outer_y = center[1] + 8 * math.sin(math.radians(angle))
-                points.append((outer_x, outer_y))
-                
-                angle += 72
-                inner_x = center[0] + 4 * math.cos(math.radians(angle))
-                inner_y = center[1] + 4 * math.sin(math.radians(angle))
-                points.append((inner_x, inner_y))
-            
-            pygame.draw.polygon(screen, self.config.COLORS['YELLOW'], points)
\ No newline at end of file
+            screen.blit(get_star_surface(self.config.COLORS['YELLOW']),
+                        (center[0] - STAR_OUTER_RADIUS, center[1] - STAR_OUTER_RADIUS))
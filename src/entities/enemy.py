@@ -4,13 +4,42 @@ Clase Enemy - Enemigos con inteligencia artificial usando Q-Learning
 
 import pygame
 import random
-import os
-from src.ai.q_learning import QLearningAgent
+from src.ai.q_learning import get_shared_agent
+from src.utils.asset_cache import load_sprite_sheet
+
+# Frames de la animación de rodar
+SPRITE_PATHS = [
+    'assets/enemy/enemy1.png',
+    'assets/enemy/enemy2.png',
+    'assets/enemy/enemy3.png'
+]
+SPRITE_SIZE = (25, 25)
+
+# Física común y salto de cada arquetipo (limita las aristas JUMP de su grafo de navegación)
+GRAVITY = 0.8
+JUMP_POWER = {"barrel": -15, "monster": -10}
+
+def max_jump_height(enemy_type):
+    """Altura en píxeles que alcanza el salto de un arquetipo"""
+    return int(JUMP_POWER[enemy_type] ** 2 / (2 * GRAVITY))
+
+def get_barrel_agent(config):
+    """Agente Q-Learning compartido por todos los barriles"""
+    return get_shared_agent(
+        "barrel",
+        state_size=6,
+        action_size=4,  # [left, right, jump, drop]
+        learning_rate=0.1,
+        discount_factor=0.95,
+        epsilon=0.2,
+        dense=config.DENSE_Q_TABLE,
+        state_bins=[11, 11, 11, 11, 2, 2]  # Dirección y suelo son binarios
+    )
 
 class Enemy:
     def __init__(self, x, y, config, enemy_type="barrel"):
         self.config = config
-        self.rect = pygame.Rect(x, y, 25, 25)
+        self.rect = pygame.Rect(x, y, *SPRITE_SIZE)
         self.enemy_type = enemy_type
         self.speed = 1.8  # 70% de velocidad (3 * 0.7)
         self.direction = 1  # Siempre hacia la derecha inicialmente
@@ -18,7 +47,8 @@ class Enemy:
         # Estado del enemigo estilo Donkey Kong
         self.velocity_x = self.speed
         self.velocity_y = 0
-        self.gravity = 0.8
+        self.gravity = GRAVITY
+        self.jump_power = JUMP_POWER.get(enemy_type, JUMP_POWER["barrel"])
         self.on_ground = False
         self.bounce_power = -12
         
@@ -45,17 +75,18 @@ class Enemy:
             self.pause_cycle = 300  # Cada 5 segundos
             self.pause_reduction = 5  # Reducir 5 frames cada vez
             
-            # IA con Q-Learning mejorada
-            self.ai_agent = QLearningAgent(
-                state_size=6,
-                action_size=4,  # [left, right, jump, drop]
-                learning_rate=0.1,
-                discount_factor=0.95,
-                epsilon=0.2
-            )
+            # IA con Q-Learning mejorada (tabla compartida por todos los barriles)
+            self.ai_agent = get_barrel_agent(config)
         
         self.active = True
         
+        # Ruta de navegación hacia el jugador (posiciones sobre plataformas)
+        self.route = []
+        self.route_goal = None
+        # Caída en curso por una arista DROP: dirección y altura desde la que se cae
+        self.drop_direction = None
+        self.drop_from_y = None
+        
         # Sistema de animación
         self.sprites = self.load_sprites()
         self.current_frame = 0
@@ -81,39 +112,57 @@ class Enemy:
         ]
         return state
     
-    def update(self, player_rect, platforms=None):
-        """Actualiza el enemigo según su tipo"""
+    def update(self, player_rect, platforms=None, ai_decision=None, experiences=None, platform_index=None,
+               physics=True):
+        """Actualiza el enemigo según su tipo (physics=False si la física se aplica en lote)"""
         if self.enemy_type == "monster":
             self.monster_behavior(player_rect, platforms)
         else:
             # Movimiento de barril rodante
-            self.barrel_movement(platforms, player_rect)
+            self.barrel_movement(platforms, player_rect, ai_decision, experiences, platform_index)
         
         # Aplicar física
-        self.apply_physics(platforms)
+        if physics:
+            self.apply_physics(platforms, platform_index)
+        
+        # La animación avanza una vez por tick, no por frame dibujado
+        self.update_animation()
     
-    def barrel_movement(self, platforms, player_rect=None):
-        """Movimiento inteligente de barril con persecución directa y validación Q-Learning"""
+    def barrel_movement(self, platforms, player_rect=None, ai_decision=None, experiences=None,
+                        platform_index=None):
+        """Movimiento inteligente de barril con persecución directa y validación Q-Learning
+        
+        ai_decision: (estado, acción) ya elegidos en lote por EntityManager
+        experiences: lista donde acumular la experiencia para learn_batch
+        platform_index: PlatformIndex del nivel para las consultas de plataforma
+        """
         if not player_rect or not platforms:
             # Movimiento básico si no hay información
             self.velocity_x = self.speed * self.direction
             return
         
         # Encontrar plataforma del jugador y actual
-        player_platform = self.find_player_platform(platforms, player_rect)
-        current_platform = self.find_current_platform(platforms)
+        player_platform = self.find_player_platform(platforms, player_rect, platform_index)
+        current_platform = self.find_current_platform(platforms, platform_index)
         
         # LÓGICA PRINCIPAL: Persecución directa del jugador
         dx = player_rect.centerx - self.rect.centerx
         dy = player_rect.centery - self.rect.centery
         
-        # Decidir acción principal basada en posición del jugador
-        primary_action = self.decide_primary_action(dx, dy, current_platform, player_platform)
+        # Decidir acción principal: seguir la ruta calculada o lógica directa
+        route_action = None if self.is_paused else self.follow_route(current_platform)
+        if route_action is not None:
+            primary_action = route_action
+        else:
+            primary_action = self.decide_primary_action(dx, dy, current_platform, player_platform)
         
         # VALIDACIÓN Q-Learning: Solo para mejorar la decisión
         if hasattr(self, 'ai_agent'):
-            state = self.get_state(player_rect)
-            q_action = self.ai_agent.choose_action(state)
+            if ai_decision:
+                state, q_action = ai_decision
+            else:
+                state = self.get_state(player_rect)
+                q_action = self.ai_agent.choose_action(state)
             
             # Usar Q-Learning solo si la acción principal no es óptima
             if self.should_override_action(primary_action, q_action, dx, dy):
@@ -123,7 +172,10 @@ class Enemy:
             reward = self.calculate_reward(player_rect)
             next_state = self.get_state(player_rect)
             done = not self.active
-            self.ai_agent.learn(state, primary_action, reward, next_state, done)
+            if experiences is not None:
+                experiences.append((state, primary_action, reward, next_state, done))
+            else:
+                self.ai_agent.learn(state, primary_action, reward, next_state, done)
         
         # Ejecutar acción decidida
         self.execute_action_decision(primary_action, current_platform, dx)
@@ -134,6 +186,63 @@ class Enemy:
         # Anti-atascamiento
         self.handle_stuck_behavior(current_platform)
     
+    def set_route(self, route, goal):
+        """Asigna una ruta calculada por el planificador"""
+        self.route = list(route)
+        self.route_goal = goal
+    
+    def clear_route(self):
+        """Olvida la ruta actual"""
+        self.route = []
+        self.route_goal = None
+        self.drop_direction = None
+        self.drop_from_y = None
+    
+    def follow_route(self, current_platform=None):
+        """Acción para avanzar por la ruta: 0 izquierda, 1 derecha, 2 saltar; None sin ruta
+        
+        current_platform: plataforma bajo el enemigo, para saber por qué borde bajar
+        """
+        # Bajando por una arista DROP: seguir hacia el borde hasta caer más allá del reborde
+        if self.drop_direction is not None:
+            if self.rect.bottom <= self.drop_from_y + 15:
+                return 1 if self.drop_direction > 0 else 0
+            self.drop_direction = None
+            self.drop_from_y = None
+        
+        # Descartar puntos de paso ya alcanzados
+        while self.route:
+            target_x, target_y = self.route[0]
+            if abs(self.rect.centerx - target_x) <= 10 and abs(self.rect.bottom - target_y) <= 20:
+                self.route.pop(0)
+            else:
+                break
+        if not self.route:
+            return None
+        
+        target_x, target_y = self.route[0]
+        dx = target_x - self.rect.centerx
+        dy = target_y - self.rect.bottom
+        
+        # Plataforma más alta cerca: saltar
+        if dy < -20 and abs(dx) < 60 and self.on_ground:
+            return 2
+        
+        # Plataforma más baja: solo se llega cayendo por un borde (arista DROP), aunque el
+        # punto de destino quede bajo la plataforma actual
+        if dy > 20 and self.on_ground:
+            if current_platform:
+                to_left = self.rect.centerx - current_platform.left
+                to_right = current_platform.right - self.rect.centerx
+                self.drop_direction = -1 if to_left < to_right else 1
+            elif dx:
+                self.drop_direction = 1 if dx > 0 else -1
+            else:
+                self.drop_direction = self.direction
+            self.drop_from_y = self.rect.bottom
+            return 1 if self.drop_direction > 0 else 0
+        return 1 if dx > 0 else 0
+    
     def decide_primary_action(self, dx, dy, current_platform, player_platform):
         """Decide la acción principal basada en lógica directa"""
         # Si está en pausa, no moverse
@@ -186,7 +295,7 @@ class Enemy:
             self.velocity_x = self.speed
         elif action == 2:  # Saltar
             if self.on_ground:
-                self.velocity_y = -15
+                self.velocity_y = self.jump_power
                 self.on_ground = False
         elif action == 3:  # Bajar o esperar
             if self.is_paused:
@@ -218,7 +327,7 @@ class Enemy:
                     self.direction *= -1
                     self.velocity_x = self.speed * self.direction
                 else:
-                    self.velocity_y = -15
+                    self.velocity_y = self.jump_power
                     self.on_ground = False
                 self.stuck_on_platform_timer = 0
         else:
@@ -276,7 +385,7 @@ class Enemy:
         elif action == 3:  # Esperar
             self.velocity_x = 0
     
-    def apply_physics(self, platforms=None):
+    def apply_physics(self, platforms=None, platform_index=None):
         """Aplica física estilo Donkey Kong"""
         # Gravedad
         if not self.on_ground:
@@ -294,8 +403,10 @@ class Enemy:
         # Actualizar posición vertical
         self.rect.y += self.velocity_y
         
-        # Colisiones con plataformas
+        # Colisiones con plataformas (solo las cercanas si hay índice)
         self.on_ground = False
+        if platform_index:
+            platforms = platform_index.query(self.rect)
         if platforms:
             for platform in platforms:
                 if self.rect.colliderect(platform) and self.velocity_y > 0:
@@ -338,8 +449,16 @@ class Enemy:
                 self.state = "hunting"
         
         elif self.state == "hunting":
+            # Seguir el campo de flujo si hay ruta
+            route_action = self.follow_route(self.find_current_platform(platforms) if platforms else None)
+            if route_action == 2:
+                self.velocity_y = self.jump_power
+                self.on_ground = False
+            elif route_action is not None:
+                self.direction = 1 if route_action == 1 else -1
+                self.velocity_x = self.speed * self.direction
             # Buscar al jugador
-            if player_rect:
+            elif player_rect:
                 dx = player_rect.centerx - self.rect.centerx
                 if abs(dx) > 10:
                     self.direction = 1 if dx > 0 else -1
@@ -350,7 +469,7 @@ class Enemy:
                 # Saltar si el jugador está arriba
                 dy = player_rect.centery - self.rect.centery
                 if dy < -40 and abs(dx) < 60 and self.on_ground:
-                    self.velocity_y = -10
+                    self.velocity_y = self.jump_power
                     self.on_ground = False
     
     def calculate_reward(self, player_rect):
@@ -367,8 +486,10 @@ class Enemy:
         
         return proximity_reward
     
-    def find_player_platform(self, platforms, player_rect):
+    def find_player_platform(self, platforms, player_rect, platform_index=None):
         """Encuentra la plataforma donde está el jugador"""
+        if platform_index:
+            return platform_index.at(player_rect.centerx, player_rect.bottom, above=20, below=10)
         for platform in platforms:
             if (player_rect.bottom <= platform.top + 20 and 
                 player_rect.bottom >= platform.top - 10 and
@@ -377,8 +498,10 @@ class Enemy:
                 return platform
         return None
     
-    def find_current_platform(self, platforms):
+    def find_current_platform(self, platforms, platform_index=None):
         """Encuentra la plataforma actual del enemigo"""
+        if platform_index:
+            return platform_index.at(self.rect.centerx, self.rect.bottom, above=10, below=10)
         for platform in platforms:
             if (self.rect.bottom <= platform.top + 10 and 
                 self.rect.bottom >= platform.top - 10 and
@@ -405,24 +528,8 @@ class Enemy:
         return False
     
     def load_sprites(self):
-        """Carga los sprites del enemigo"""
-        sprites = []
-        sprite_paths = [
-            'assets/enemy/enemy1.png',
-            'assets/enemy/enemy2.png', 
-            'assets/enemy/enemy3.png'
-        ]
-        
-        for path in sprite_paths:
-            if os.path.exists(path):
-                try:
-                    sprite = pygame.image.load(path)
-                    sprite = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
-                    sprites.append(sprite)
-                except:
-                    pass
-        
-        return sprites if sprites else None
+        """Carga los sprites del enemigo (compartidos desde la caché de imágenes)"""
+        return load_sprite_sheet(SPRITE_PATHS, (self.rect.width, self.rect.height))
     
     def update_animation(self):
         """Actualiza la animación del sprite"""
@@ -434,15 +541,9 @@ class Enemy:
     
     def render(self, screen):
         """Renderiza el enemigo"""
-        # Actualizar animación
-        self.update_animation()
-        
         if self.sprites:
-            # Renderizar sprite animado
-            sprite = self.sprites[self.current_frame]
-            # Voltear sprite según dirección
-            if self.direction == -1:
-                sprite = pygame.transform.flip(sprite, True, False)
+            # Renderizar sprite animado (ya volteado según dirección)
+            sprite = self.sprites.frame(self.current_frame, self.direction)
             screen.blit(sprite, self.rect)
             
             # Indicador de estado para monstruos
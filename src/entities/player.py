@@ -3,13 +3,19 @@ Clase Player - Maneja el jugador principal
 """
 
 import pygame
-import os
+from src.utils.asset_cache import load_sprite_sheet
+from src.utils.text_cache import get_font
+
+# Sprites del jugador: sprite_00 en reposo, sprite_01 a sprite_11 para el salto
+IDLE_SPRITE_PATH = 'assets/player/sprite_00.png'
+JUMP_SPRITE_PATHS = [f'assets/player/sprite_{i:02d}.png' for i in range(1, 12)]
+SPRITE_SIZE = (40, 55)
 
 class Player:
     def __init__(self, x, y, config, color='BLUE', sound_manager=None):
         self.config = config
         self.sound_manager = sound_manager
-        self.rect = pygame.Rect(x, y, 40, 55)
+        self.rect = pygame.Rect(x, y, *SPRITE_SIZE)
         self.velocity_x = 0
         self.velocity_y = 0
         self.speed = 5
@@ -32,9 +38,10 @@ class Player:
         self.jump_frame = 0  # Frame actual del salto
         self.is_jumping_animation = False
         
-    def update(self, platforms=None):
-        """Actualiza el estado del jugador"""
-        keys = pygame.key.get_pressed()
+    def update(self, platforms=None, keys=None, platform_index=None):
+        """Actualiza el estado del jugador (keys permite controlarlo sin teclado)"""
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Movimiento horizontal
         self.velocity_x = 0
@@ -68,8 +75,10 @@ class Player:
         # Actualizar posición vertical
         self.rect.y += self.velocity_y
         
-        # Colisiones con plataformas
+        # Colisiones con plataformas (solo las cercanas si hay índice)
         self.on_ground = False
+        if platform_index:
+            platforms = platform_index.query(self.rect)
         if platforms:
             for platform in platforms:
                 if self.rect.colliderect(platform) and self.velocity_y > 0:
@@ -86,6 +95,9 @@ class Player:
         elif self.rect.bottom > self.config.WINDOW_HEIGHT:
             self.take_damage()
             self.rect.bottom = self.config.WINDOW_HEIGHT - 50
+        
+        # La animación avanza una vez por tick, no por frame dibujado
+        self.update_animation()
     
     def add_points(self, points):
         """Agrega puntos al jugador"""
@@ -102,33 +114,12 @@ class Player:
         self.on_ground = True
     
     def load_sprites(self):
-        """Carga los sprites del jugador"""
+        """Carga los sprites del jugador (compartidos desde la caché de imágenes)"""
+        size = (self.rect.width, self.rect.height)
         sprites = {
-            'idle': [],
-            'jump': []
+            'idle': load_sprite_sheet([IDLE_SPRITE_PATH], size),
+            'jump': load_sprite_sheet(JUMP_SPRITE_PATHS, size)
         }
-        
-        # Cargar sprites de salto (sprite_01 a sprite_11)
-        for i in range(1, 12):
-            sprite_path = f'assets/player/sprite_{i:02d}.png'
-            if os.path.exists(sprite_path):
-                try:
-                    sprite = pygame.image.load(sprite_path)
-                    sprite = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
-                    sprites['jump'].append(sprite)
-                except:
-                    pass
-        
-        # Usar sprite_00 para idle si existe
-        idle_path = 'assets/player/sprite_00.png'
-        if os.path.exists(idle_path):
-            try:
-                sprite = pygame.image.load(idle_path)
-                sprite = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
-                sprites['idle'].append(sprite)
-            except:
-                pass
-        
         return sprites if any(sprites.values()) else None
     
     def update_animation(self):
@@ -155,22 +146,17 @@ class Player:
     
     def render(self, screen):
         """Renderiza el jugador"""
-        # Actualizar animación
-        self.update_animation()
-        
         if self.sprites:
             # Seleccionar sprite según estado
             if self.is_jumping_animation and self.sprites['jump']:
-                sprite = self.sprites['jump'][self.jump_frame]
+                sprite = self.sprites['jump'].frame(self.jump_frame, self.direction)
             elif self.sprites['idle']:
-                sprite = self.sprites['idle'][0]  # Usar primer frame idle
+                sprite = self.sprites['idle'].frame(0, self.direction)  # Usar primer frame idle
             else:
                 sprite = None
             
             if sprite:
-                # Voltear sprite según dirección
-                if self.direction == -1:
-                    sprite = pygame.transform.flip(sprite, True, False)
+                # El atlas ya incluye el sprite volteado según dirección
                 screen.blit(sprite, self.rect)
             else:
                 # Fallback: rectángulo
@@ -183,7 +169,7 @@ class Player:
             pygame.draw.circle(screen, self.config.COLORS['WHITE'], face_center, 3)
         
         # Renderizar información del jugador
-        font = pygame.font.Font(None, 36)
+        font = get_font(36)
         lives_text = font.render(f"Vidas: {self.lives}", True, self.config.COLORS['WHITE'])
         screen.blit(lives_text, (10, 10))
         
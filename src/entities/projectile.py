@@ -57,7 +57,7 @@ class Projectile:
         """Explota el proyectil"""
         if not self.exploded:
             self.exploded = True
-            self.explosion_timer = 30  # Duración de la explosión
+            self.explosion_timer = 15  # Duración de la explosión en ticks
             self.velocity_x = 0
             self.velocity_y = 0
     
@@ -84,9 +84,6 @@ class Projectile:
                                      explosion_rect.center, explosion_rect.width//2)
                     pygame.draw.circle(screen, self.config.COLORS['RED'], 
                                      explosion_rect.center, explosion_rect.width//3)
-                self.explosion_timer -= 1
-                if self.explosion_timer <= 0:
-                    self.active = False
         else:
             # Renderizar banana
             pygame.draw.ellipse(screen, self.config.COLORS['YELLOW'], self.rect)
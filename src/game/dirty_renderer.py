@@ -0,0 +1,67 @@
+"""
+Render por rectángulos sucios: solo se envían a la pantalla las zonas que cambian
+"""
+
+import pygame
+
+class DirtyRectRenderer:
+    """Mantiene el fondo estático del nivel y repinta solo lo que se movió desde el frame anterior"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.background = None
+        self.background_key = None
+        self.previous_rects = []
+        self.full_redraw = True
+        
+        # Zonas del HUD que se repintan siempre (texto del jugador, tienda, instrucciones)
+        width = config.WINDOW_WIDTH
+        self.hud_rects = [
+            pygame.Rect(0, 0, 300, 170),
+            pygame.Rect(width - 152, 8, 144, 64),
+        ]
+        self.tutorial_rects = [pygame.Rect(0, 25, width, 50)]
+    
+    def invalidate(self):
+        """Fuerza un repintado completo en el siguiente frame (cambio de estado o de nivel)"""
+        self.full_redraw = True
+        self.previous_rects = []
+    
+    def get_background(self, level):
+        """Capa estática (fondo y nivel): la superficie opaca del nivel, sin copiarla"""
+        key = level.get_surface() if level else None
+        if self.background is None or key is not self.background_key:
+            if key is not None:
+                self.background = key
+            else:
+                size = (self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT)
+                self.background = pygame.Surface(size).convert() if pygame.display.get_surface() else pygame.Surface(size)
+                self.background.fill(self.config.COLORS['BLACK'])
+            self.background_key = key
+            self.full_redraw = True
+        return self.background
+    
+    def render(self, screen, level, draw_dynamic):
+        """Borra lo dibujado en el frame anterior, dibuja lo dinámico y actualiza solo esas zonas
+        
+        draw_dynamic(screen) dibuja entidades y HUD y retorna los rectángulos que tocó.
+        """
+        background = self.get_background(level)
+        if self.full_redraw:
+            screen.blit(background, (0, 0))
+            self.previous_rects = self.clip(draw_dynamic(screen))
+            pygame.display.flip()
+            self.full_redraw = False
+            return
+        
+        for rect in self.previous_rects:
+            screen.blit(background, rect, rect)
+        rects = self.clip(draw_dynamic(screen))
+        pygame.display.update(self.previous_rects + rects)
+        self.previous_rects = rects
+    
+    def clip(self, rects):
+        """Recorta los rectángulos a la pantalla y descarta los vacíos"""
+        screen_rect = pygame.Rect(0, 0, self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT)
+        clipped = [rect.clip(screen_rect) for rect in rects]
+        return [rect for rect in clipped if rect.width > 0 and rect.height > 0]
@@ -2,55 +2,125 @@
 Gestor principal del juego - Controla el bucle principal y estados
 """
 
+import time
 import pygame
+from functools import cached_property
 from src.managers.level_manager import LevelManager
 from src.managers.ui_manager import UIManager
 from src.managers.shop_manager import ShopManager
 from src.managers.entity_manager import EntityManager
 from src.managers.collision_manager import CollisionManager
 from src.managers.game_state_manager import GameStateManager
-from src.ui.shop_menu import ShopMenu
 from src.managers.firebase_manager import FirebaseManager
 from src.managers.sound_manager import SoundManager
 from src.managers.save_manager import SaveManager
 from src.managers.auth_manager import AuthManager
+from src.ai.checkpoint import CheckpointWriter
+from src.game.dirty_renderer import DirtyRectRenderer
+from src.utils.asset_cache import preload_images
+from src.utils.startup import startup_timer, warm_up_imports
+from src.entities.player import IDLE_SPRITE_PATH, JUMP_SPRITE_PATHS, SPRITE_SIZE as PLAYER_SPRITE_SIZE
+from src.entities.enemy import SPRITE_PATHS as ENEMY_SPRITE_PATHS, SPRITE_SIZE as ENEMY_SPRITE_SIZE
+from src.ui.menu import MENU_IMAGE_PATH
+from src.ai.q_learning import get_shared_agents
 import pygame
+from src.utils.text_cache import get_font
 
 class GameManager:
     def __init__(self, config):
         self.config = config
-        self.screen = pygame.display.set_mode((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
-        pygame.display.set_caption("Donkey Kong Classic")
-        self.clock = pygame.time.Clock()
+        with startup_timer.phase("ventana"):
+            self.screen = pygame.display.set_mode((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
+            pygame.display.set_caption("Donkey Kong Classic")
+            self.clock = pygame.time.Clock()
+        
+        # Leer en segundo plano el fondo del menú (mientras se crean los managers) y luego los
+        # sprites del juego mientras se muestran los menús
+        with startup_timer.phase("precarga en segundo plano"):
+            preload_images(
+                [(MENU_IMAGE_PATH, (config.WINDOW_WIDTH, config.WINDOW_HEIGHT), False)] +
+                [(path, PLAYER_SPRITE_SIZE) for path in [IDLE_SPRITE_PATH] + JUMP_SPRITE_PATHS] +
+                [(path, ENEMY_SPRITE_SIZE) for path in ENEMY_SPRITE_PATHS]
+            )
         
         # Estados del juego
         self.running = True
         self.player_color = 'BLUE'
         self.mouse_pos = (0, 0)
         
-        # Inicializar componentes
-        self.firebase_manager = FirebaseManager(config)
-        self.sound_manager = SoundManager()
-        self.save_manager = SaveManager()
-        self.auth_manager = AuthManager(config)
+        # Inicializar componentes (el sonido se carga en su propio hilo)
+        with startup_timer.phase("servicios"):
+            self.firebase_manager = FirebaseManager(config)
+            self.sound_manager = SoundManager()
+            self.save_manager = SaveManager()
+            self.auth_manager = AuthManager(config)
         
         # Managers
-        self.ui_manager = UIManager(config, self.auth_manager, self.firebase_manager, self.save_manager, self.sound_manager)
-        self.shop_manager = ShopManager(config)
-        self.entity_manager = EntityManager(config)
-        self.collision_manager = CollisionManager(config, self.sound_manager, self.auth_manager, self.firebase_manager)
-        self.game_state_manager = GameStateManager(config)
-        self.shop_menu = ShopMenu(config)
-        self.level_manager = LevelManager(config)
-        self.level = None
+        with startup_timer.phase("managers"):
+            self.ui_manager = UIManager(config, self.auth_manager, self.firebase_manager, self.save_manager, self.sound_manager)
+            self.shop_manager = ShopManager(config)
+            self.entity_manager = EntityManager(config)
+            self.collision_manager = CollisionManager(config, self.sound_manager, self.auth_manager, self.firebase_manager)
+            self.game_state_manager = GameStateManager(config)
+            self.level_manager = LevelManager(config)
+            self.level = None
+            
+            # Checkpoints de IA en segundo plano
+            self.checkpoint_writer = CheckpointWriter()
+            
+            # Render por rectángulos sucios (opcional, para comparar con el render completo)
+            self.dirty_renderer = DirtyRectRenderer(config) if config.DIRTY_RECT_RENDERING else None
+    
+    @cached_property
+    def shop_menu(self):
+        """Menú de la tienda, construido la primera vez que se abre"""
+        from src.ui.shop_menu import ShopMenu
+        return ShopMenu(self.config)
         
     def run(self):
-        """Bucle principal del juego"""
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(self.config.FPS)
+        """Bucle principal: simulación a paso fijo y render interpolado entre ticks"""
+        tick_time = 1.0 / self.config.TICK_RATE
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        first_frame_start = previous_time
+        try:
+            while self.running:
+                current_time = time.perf_counter()
+                # Limitar el salto tras una pausa larga (ventana arrastrada, breakpoint...)
+                accumulator += min(current_time - previous_time, 0.25)
+                previous_time = current_time
+                
+                self.handle_events()
+                self.firebase_manager.process_callbacks()
+                
+                # Ticks pendientes; bajo carga se omiten renders, no ticks
+                ticks = 0
+                while accumulator >= tick_time and ticks < self.config.MAX_TICKS_PER_FRAME:
+                    self.entity_manager.store_previous_positions()
+                    self.update()
+                    accumulator -= tick_time
+                    ticks += 1
+                if ticks == self.config.MAX_TICKS_PER_FRAME:
+                    # Demasiado atrasado: descartar el resto en lugar de acumular retraso
+                    accumulator = min(accumulator, tick_time)
+                
+                self.render(accumulator / tick_time)
+                if not startup_timer.finished:
+                    startup_timer.record("primer frame", time.perf_counter() - first_frame_start)
+                    startup_timer.finish()
+                    # Con el menú ya en pantalla, importar requests antes de la primera petición
+                    warm_up_imports(['requests'])
+                self.clock.tick(self.config.FPS)
+        finally:
+            # Guardar lo aprendido por la IA al salir
+            self.checkpoint_ai_models()
+            self.checkpoint_writer.close()
+            self.firebase_manager.close()
+    
+    def checkpoint_ai_models(self):
+        """Encola un checkpoint incremental de los agentes compartidos (no bloquea)"""
+        for agent in get_shared_agents().values():
+            self.checkpoint_writer.request(agent)
     
     def handle_events(self):
         """Maneja eventos del juego"""
@@ -168,7 +238,7 @@ class GameManager:
             platforms = self.level.get_platforms() if self.level else []
             
             # Actualizar entidades
-            self.entity_manager.update_all(platforms)
+            self.entity_manager.update_all(platforms, level=self.level)
             
             # Actualizar tutorial
             if self.game_state_manager.get_state() == "TUTORIAL":
@@ -194,6 +264,8 @@ class GameManager:
             
             if game_state:
                 self.game_state_manager.set_state(game_state)
+                if game_state == "LEVEL_COMPLETE":
+                    self.checkpoint_ai_models()
             
             self.game_state_manager.collectibles_collected = collectibles
     
@@ -201,15 +273,32 @@ class GameManager:
     
 
     
-    def render(self):
-        """Renderiza todos los elementos del juego"""
-        self.screen.fill(self.config.COLORS['BLACK'])
+    def render(self, alpha=1.0):
+        """Renderiza todos los elementos del juego (alpha: fracción entre el tick anterior y el actual)"""
+        if self.game_state_manager.is_playing():
+            # La partida avanza: la próxima pausa debe capturar un fondo nuevo (también con rectángulos sucios)
+            self.ui_manager.clear_frozen_background()
+        
+        if self.dirty_renderer:
+            if self.game_state_manager.is_playing():
+                self.dirty_renderer.render(self.screen, self.level,
+                                           lambda screen: self._render_game_dynamic(alpha))
+                return
+            # Fuera de la partida se pinta todo; al volver se repinta completo una vez
+            self.dirty_renderer.invalidate()
+        
+        # La superficie del nivel ya es opaca e incluye el fondo negro: en partida no hace falta limpiar
+        if not (self.game_state_manager.is_playing() and self.level):
+            self.screen.fill(self.config.COLORS['BLACK'])
         
         # Renderizar juego si está en estados de juego
         if self.game_state_manager.is_playing():
-            self._render_game()
+            self._render_game(alpha)
         elif self.game_state_manager.get_state() == "SHOP":
-            self._render_game()
+            # El juego está detenido: se congela el fondo hasta que una compra cambie el HUD
+            player = self.entity_manager.player
+            key = ("SHOP", player.lives, player.score, player.total_points, player.bananas) if player else "SHOP"
+            self.ui_manager.render_frozen_background(self.screen, key, lambda surface: self._render_game())
             self.shop_menu.render(self.screen, self.entity_manager.player, self.shop_manager)
         else:
             # Usar UI Manager para otros estados
@@ -224,12 +313,16 @@ class GameManager:
         
         pygame.display.flip()
     
-    def _render_game(self):
+    def _render_game(self, alpha=1.0):
         """Renderiza elementos del juego"""
         if self.level:
             self.level.render(self.screen)
         
-        self.entity_manager.render_all(self.screen)
+        self._render_game_dynamic(alpha)
+    
+    def _render_game_dynamic(self, alpha=1.0):
+        """Renderiza entidades y HUD; retorna las zonas de pantalla que pueden haber cambiado"""
+        drawn = self.entity_manager.render_all(self.screen, alpha)
         
         # Renderizar indicador de tienda
         self.render_shop_indicator()
@@ -237,6 +330,16 @@ class GameManager:
         # Renderizar tutorial si está activo
         if self.game_state_manager.get_state() == "TUTORIAL":
             self.game_state_manager.render_tutorial(self.screen, self.entity_manager.player)
+        
+        if self.dirty_renderer:
+            drawn.extend(self.dirty_renderer.hud_rects)
+            if self.game_state_manager.get_state() == "TUTORIAL":
+                drawn.extend(self.dirty_renderer.tutorial_rects)
+                player = self.entity_manager.player
+                if player:
+                    # Marcador "TÚ" sobre el jugador
+                    drawn.append(pygame.Rect(player.rect.centerx - 40, player.rect.top - 60, 80, 60))
+        return drawn
     
 
     
@@ -249,7 +352,7 @@ class GameManager:
             pygame.draw.rect(self.screen, self.config.COLORS['WHITE'], shop_rect, 2)
             
             # Texto de la tienda
-            font = pygame.font.Font(None, 24)
+            font = get_font(24)
             shop_text = font.render("TIENDA", True, self.config.COLORS['WHITE'])
             text_rect = shop_text.get_rect(center=(shop_rect.centerx, shop_rect.centery - 10))
             self.screen.blit(shop_text, text_rect)
@@ -3,12 +3,21 @@ Clase Level - Maneja la estructura y renderizado de niveles
 """
 
 import pygame
+from src.ai.navigation import NavigationGraph, FlowField
+from src.utils.platform_index import PlatformIndex
 
 class Level:
     def __init__(self, config):
         self.config = config
         self.platforms = []
         self.ladders = []
+        self.navigation_graphs = {}
+        self.navigation_platforms = None
+        self.flow_fields = {}
+        self.platform_index = None
+        self.platform_index_source = None
+        self.surface = None
+        self.surface_source = None
         self.create_level_1()
     
     def create_level_1(self):
@@ -29,16 +38,39 @@ class Level:
             pygame.Rect(200, 250, 20, 100),    # Escalera 3
             pygame.Rect(600, 150, 20, 100),    # Escalera 4
         ]
+        self.invalidate_surface()
     
     def render(self, screen):
-        """Renderiza el nivel"""
-        # Renderizar plataformas
-        for platform in self.platforms:
-            pygame.draw.rect(screen, self.config.COLORS['BROWN'], platform)
-        
-        # Renderizar escaleras
-        for ladder in self.ladders:
-            pygame.draw.rect(screen, self.config.COLORS['YELLOW'], ladder)
+        """Renderiza el fondo y el nivel (un solo blit opaco que cubre toda la pantalla)"""
+        screen.blit(self.get_surface(), (0, 0))
+    
+    def get_surface(self):
+        """Fondo negro, plataformas y escaleras pintados una vez sobre una superficie opaca"""
+        # También se regenera si se reemplazan las listas (create_random_level)
+        if (self.surface is None or self.surface_source[0] is not self.platforms or
+                self.surface_source[1] is not self.ladders):
+            size = (self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT)
+            surface = pygame.Surface(size)
+            if pygame.display.get_surface():
+                surface = surface.convert()
+            surface.fill(self.config.COLORS['BLACK'])
+            
+            # Renderizar plataformas
+            for platform in self.platforms:
+                pygame.draw.rect(surface, self.config.COLORS['BROWN'], platform)
+            
+            # Renderizar escaleras
+            for ladder in self.ladders:
+                pygame.draw.rect(surface, self.config.COLORS['YELLOW'], ladder)
+            
+            self.surface = surface
+            self.surface_source = (self.platforms, self.ladders)
+        return self.surface
+    
+    def invalidate_surface(self):
+        """Descarta la superficie precalculada (llamar si cambia la geometría del nivel)"""
+        self.surface = None
+        self.surface_source = None
     
     def get_platforms(self):
         """Retorna las plataformas para detección de colisiones"""
@@ -48,6 +80,37 @@ class Level:
         """Retorna las escaleras para detección de colisiones"""
         return self.ladders
     
+    def get_platform_index(self):
+        """Índice estático de plataformas (se reconstruye si cambian las plataformas)"""
+        if self.platform_index is None or self.platform_index_source is not self.platforms:
+            self.platform_index = PlatformIndex(self.platforms)
+            self.platform_index_source = self.platforms
+        return self.platform_index
+    
+    def get_navigation_graph(self, max_jump_height=140):
+        """Grafo de navegación compartido por los enemigos con un mismo salto
+        
+        max_jump_height: altura que alcanza el salto del arquetipo; hay un grafo por altura
+        (se reconstruyen si cambian las plataformas)
+        """
+        if self.navigation_platforms is not self.platforms:
+            self.navigation_graphs = {}
+            self.flow_fields = {}
+            self.navigation_platforms = self.platforms
+        graph = self.navigation_graphs.get(max_jump_height)
+        if graph is None:
+            graph = NavigationGraph(self.platforms, max_jump_height=max_jump_height)
+            self.navigation_graphs[max_jump_height] = graph
+        return graph
+    
+    def get_flow_field(self, max_jump_height=140):
+        """Campo de flujo del nivel para que los enemigos persigan a un mismo objetivo"""
+        graph = self.get_navigation_graph(max_jump_height)
+        flow_field = self.flow_fields.get(max_jump_height)
+        if flow_field is None:
+            flow_field = self.flow_fields[max_jump_height] = FlowField(graph)
+        return flow_field
+    
     def create_level_2(self):
         """Crea el segundo nivel - Más complejo"""
         self.platforms = [
@@ -67,6 +130,7 @@ class Level:
             pygame.Rect(550, 380, 20, 100),    # Escalera 4
             pygame.Rect(380, 180, 20, 100),    # Escalera 5
         ]
+        self.invalidate_surface()
     
     def create_level_3(self):
         """Crea el tercer nivel - Muy difícil"""
@@ -90,4 +154,5 @@ class Level:
             pygame.Rect(150, 320, 20, 130),    # Escalera larga
             pygame.Rect(400, 280, 20, 140),    # Escalera central
             pygame.Rect(580, 200, 20, 80),     # Escalera alta
-        ]
\ No newline at end of file
+        ]
+        self.invalidate_surface()
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+Simulación sin ventana ni límite de FPS para entrenar la IA de los enemigos
+"""
+
+import copy
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import pygame
+from src.managers.level_manager import LevelManager
+from src.managers.entity_manager import EntityManager
+from src.managers.collision_manager import CollisionManager
+from src.managers.game_state_manager import GameStateManager
+from src.entities.enemy import get_barrel_agent
+
+class NullSoundManager:
+    """Gestor de sonido mudo para la simulación"""
+    def play_sound(self, sound_name):
+        pass
+    
+    def play_music(self, music_name, loop=-1):
+        pass
+
+class NullAuthManager:
+    """Gestor de autenticación que no guarda puntuaciones"""
+    def update_best_score(self, score, firebase_manager=None):
+        pass
+
+def random_policy(simulation):
+    """Política aleatoria: mantiene una dirección unos frames y salta al azar"""
+    if simulation.policy_timer <= 0:
+        simulation.policy_direction = random.choice([-1, 0, 1])
+        simulation.policy_timer = random.randint(10, 60)
+    simulation.policy_timer -= 1
+    
+    keys = defaultdict(bool)
+    keys[pygame.K_LEFT] = simulation.policy_direction == -1
+    keys[pygame.K_RIGHT] = simulation.policy_direction == 1
+    keys[pygame.K_SPACE] = random.random() < 0.03
+    return keys
+
+def scripted_policy(simulation):
+    """Política guiada: va hacia la estrella más cercana y salta si está arriba"""
+    player = simulation.entity_manager.player
+    collectibles = simulation.entity_manager.collectibles
+    if not collectibles:
+        return random_policy(simulation)
+    
+    target = min(collectibles, key=lambda c: abs(c.rect.centerx - player.rect.centerx) +
+                 abs(c.rect.centery - player.rect.centery))
+    dx = target.rect.centerx - player.rect.centerx
+    dy = target.rect.centery - player.rect.centery
+    
+    keys = defaultdict(bool)
+    keys[pygame.K_LEFT] = dx < -5
+    keys[pygame.K_RIGHT] = dx > 5
+    keys[pygame.K_SPACE] = dy < -30 or random.random() < 0.01
+    return keys
+
+POLICIES = {
+    'random': random_policy,
+    'scripted': scripted_policy
+}
+
+class HeadlessSimulation:
+    """Ejecuta la lógica del juego (entidades, colisiones, niveles) sin render ni sonido"""
+    
+    def __init__(self, config, policy=random_policy, seed=None):
+        self.config = config
+        self.policy = policy
+        if seed is not None:
+            random.seed(seed)
+            try:
+                import numpy as np
+                np.random.seed(seed)
+            except ImportError:
+                pass
+        
+        self.sound_manager = NullSoundManager()
+        self.level_manager = LevelManager(config)
+        self.entity_manager = EntityManager(config)
+        self.collision_manager = CollisionManager(config, self.sound_manager, NullAuthManager(), None)
+        self.game_state_manager = GameStateManager(config)
+        self.game_state_manager.tutorial_manager.complete()
+        self.level = None
+        
+        # Estado de la política del jugador
+        self.policy_direction = 0
+        self.policy_timer = 0
+        self.ticks = 0
+    
+    def reset(self, level_number=1):
+        """Prepara un episodio nuevo en el nivel indicado"""
+        self.level_manager.current_level = level_number
+        self.entity_manager.reset_level()
+        self.entity_manager.clear_all()
+        self.level, enemies = self.level_manager.create_level(level_number)
+        self.entity_manager.create_player(100, 500, 'BLUE', self.sound_manager)
+        self.entity_manager.add_enemies(enemies)
+        self.game_state_manager.collectibles_collected = 0
+        self.game_state_manager.set_state("PLAYING")
+    
+    def step(self):
+        """Avanza un frame de simulación; retorna el estado si cambió"""
+        self.ticks += 1
+        platforms = self.level.get_platforms() if self.level else []
+        
+        self.entity_manager.update_all(platforms, self.policy(self), self.level)
+        self.entity_manager.spawn_entities()
+        
+        # Spawn de coleccionables (igual que GameManager.update)
+        self.entity_manager.spawn_timer += 1
+        if self.entity_manager.spawn_timer > 120:
+            self.entity_manager.spawn_collectibles(self.level)
+            self.entity_manager.spawn_timer = 0
+        
+        game_state, collectibles = self.collision_manager.check_all_collisions(
+            self.entity_manager,
+            self.game_state_manager.collectibles_collected,
+            self.game_state_manager.collectibles_needed
+        )
+        self.game_state_manager.collectibles_collected = collectibles
+        
+        if game_state == "LEVEL_COMPLETE":
+            new_level = self.game_state_manager.continue_to_next_level(self.level_manager, self.entity_manager)
+            if new_level:
+                self.level = new_level
+        return game_state
+    
+    def run_episode(self, level_number=1, max_ticks=3600):
+        """Juega un episodio hasta GAME_OVER o max_ticks; retorna los frames simulados"""
+        self.reset(level_number)
+        for tick in range(max_ticks):
+            if self.step() == "GAME_OVER":
+                return tick + 1
+        return max_ticks
+
+def train(config, episodes=100, max_ticks=3600, policy='random', levels=(1, 2, 3), seed=None):
+    """Entrena a los agentes compartidos con episodios simulados y retorna estadísticas"""
+    simulation = HeadlessSimulation(config, POLICIES[policy], seed)
+    total_ticks = 0
+    start_time = time.perf_counter()
+    
+    for episode in range(episodes):
+        level_number = levels[episode % len(levels)]
+        total_ticks += simulation.run_episode(level_number, max_ticks)
+    
+    elapsed = time.perf_counter() - start_time
+    return {
+        'episodes': episodes,
+        'ticks': total_ticks,
+        'seconds': elapsed,
+        'ticks_per_second': total_ticks / elapsed if elapsed > 0 else 0
+    }
+
+def _run_training_task(task):
+    """Ejecuta episodios en un proceso trabajador partiendo de la tabla maestra"""
+    config, seed, levels, episodes, max_ticks, policy, master = task
+    agent = get_barrel_agent(config)
+    agent.import_table(*master)
+    
+    simulation = HeadlessSimulation(config, POLICIES[policy], seed)
+    ticks = 0
+    for episode in range(episodes):
+        ticks += simulation.run_episode(levels[episode % len(levels)], max_ticks)
+    return agent.export_table(), agent.epsilon, ticks
+
+def train_parallel(config, rounds=10, workers=None, episodes_per_round=5, max_ticks=3600,
+                   policy='random', levels=None, seed=0):
+    """Entrena en varios procesos y combina sus tablas Q al final de cada ronda"""
+    workers = workers or os.cpu_count() or 1
+    # Por defecto niveles aleatorios (create_random_level) además de los fijos
+    levels = list(levels or range(1, 14))
+    
+    # Combinar tablas necesita la tabla densa, sin importar el ajuste DENSE_Q_TABLE del juego
+    config = copy.copy(config)
+    config.DENSE_Q_TABLE = True
+    master = get_barrel_agent(config)
+    if not master.dense:
+        raise RuntimeError("El entrenamiento en paralelo necesita NumPy para la tabla Q densa")
+    
+    total_ticks = 0
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for round_number in range(rounds):
+            ids, q_values, _ = master.export_table()
+            snapshot = (ids, q_values, master.epsilon)
+            tasks = []
+            for worker in range(workers):
+                # Cada trabajador empieza en un nivel distinto con su propia semilla
+                offset = (round_number * workers + worker) % len(levels)
+                worker_levels = levels[offset:] + levels[:offset]
+                worker_seed = seed + round_number * workers + worker
+                tasks.append((config, worker_seed, worker_levels, episodes_per_round,
+                              max_ticks, policy, snapshot))
+            
+            results = list(pool.map(_run_training_task, tasks))
+            master.merge_tables([table for table, _, _ in results])
+            master.epsilon = sum(epsilon for _, epsilon, _ in results) / len(results)
+            total_ticks += sum(ticks for _, _, ticks in results)
+    
+    elapsed = time.perf_counter() - start_time
+    return {
+        'episodes': rounds * workers * episodes_per_round,
+        'ticks': total_ticks,
+        'seconds': elapsed,
+        'ticks_per_second': total_ticks / elapsed if elapsed > 0 else 0
+    }
@@ -4,12 +4,13 @@ Gestor de autenticación con Firebase
 
 import json
 import os
-import webbrowser
-import requests
 from datetime import datetime
-from dotenv import load_dotenv
+from src.utils.startup import LazyModule
+
+# Se importan al primer uso (requests tarda ~0.1 s y no hace falta para mostrar el menú)
+requests = LazyModule('requests')
+webbrowser = LazyModule('webbrowser')
 
-load_dotenv()
 class AuthManager:
     def __init__(self, config):
         self.config = config
@@ -14,6 +14,9 @@ class CollisionManager:
         if not entity_manager.player:
             return None, collectibles_collected
         
+        # Fase amplia: índices con las posiciones de este frame
+        entity_manager.rebuild_spatial_index()
+        
         # Colisiones con enemigos
         game_state = self.check_enemy_collisions(entity_manager)
         if game_state:
@@ -39,7 +42,7 @@ class CollisionManager:
     
     def check_enemy_collisions(self, entity_manager):
         """Verifica colisiones con enemigos"""
-        for enemy in entity_manager.enemies:
+        for enemy in entity_manager.enemy_index.query(entity_manager.player.rect):
             if entity_manager.player.rect.colliderect(enemy.rect):
                 self.sound_manager.play_sound('damage')
                 entity_manager.player.take_damage()
@@ -54,7 +57,7 @@ class CollisionManager:
     
     def check_collectible_collisions(self, entity_manager, collectibles_collected, collectibles_needed):
         """Verifica colisiones con coleccionables"""
-        for collectible in entity_manager.collectibles[:]:
+        for collectible in entity_manager.collectible_index.query(entity_manager.player.rect):
             if (not collectible.collected and 
                 entity_manager.player.rect.colliderect(collectible.rect)):
                 
@@ -68,16 +71,18 @@ class CollisionManager:
     
     def check_projectile_collisions(self, entity_manager):
         """Verifica colisiones de proyectiles con enemigos"""
+        removed = set()
         for projectile in entity_manager.projectiles[:]:
             if projectile.exploded:
                 explosion_rect = projectile.get_explosion_rect()
                 if explosion_rect:
                     enemies_to_remove = []
-                    for enemy in entity_manager.enemies:
-                        if enemy.rect.colliderect(explosion_rect):
+                    for enemy in entity_manager.enemy_index.query(explosion_rect):
+                        if enemy not in removed and enemy.rect.colliderect(explosion_rect):
                             enemies_to_remove.append(enemy)
                     
                     for enemy in enemies_to_remove:
+                        removed.add(enemy)
                         entity_manager.enemies.remove(enemy)
                         if entity_manager.player:
                             entity_manager.player.add_points(100)
@@ -108,4 +113,6 @@ class CollisionManager:
             if hasattr(enemy, 'jump_timer'):
                 enemy.jump_timer = 0
             if hasattr(enemy, 'stuck_timer'):
-                enemy.stuck_timer = 0
\ No newline at end of file
+                enemy.stuck_timer = 0
+            if hasattr(enemy, 'clear_route'):
+                enemy.clear_route()
\ No newline at end of file
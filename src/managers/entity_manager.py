@@ -3,11 +3,20 @@ Gestor de entidades - Maneja jugador, enemigos, coleccionables y proyectiles
 """
 
 import random
+from src.ai.navigation import PathScheduler
+from src.utils.spatial_hash import SpatialHash
+from src.managers.entity_store import EntityStore, HAS_NUMPY
 from src.entities.player import Player
-from src.entities.enemy import Enemy
+from src.entities.enemy import Enemy, max_jump_height
 from src.entities.collectible import Collectible
 from src.entities.projectile import Projectile
 
+# Saltos mayores (en píxeles) se consideran teletransportes y no se interpolan
+MAX_INTERPOLATION_DISTANCE = 64
+
+# Margen alrededor del rect de cada entidad para lo que dibuja fuera de él (indicadores)
+RENDER_MARGIN = 16
+
 class EntityManager:
     def __init__(self, config):
         self.config = config
@@ -21,6 +30,16 @@ class EntityManager:
         self.monster_spawn_timer = 0
         self.monsters_spawned = 0
         self.monsters_per_level = 3
+        
+        # Búsquedas de caminos con presupuesto por frame
+        self.path_scheduler = PathScheduler()
+        
+        # Índices espaciales (fase amplia de colisiones), reconstruidos cada frame
+        self.enemy_index = SpatialHash()
+        self.collectible_index = SpatialHash()
+        
+        # Física en lote (estructura de arrays) opcional
+        self.entity_store = EntityStore(config) if config.SOA_ENTITIES and HAS_NUMPY else None
     
     def create_player(self, x, y, color, sound_manager):
         """Crea el jugador"""
@@ -31,27 +50,114 @@ class EntityManager:
         """Agrega enemigos a la lista"""
         self.enemies.extend(enemies)
     
-    def update_all(self, platforms=None):
+    def update_all(self, platforms=None, player_keys=None, level=None):
         """Actualiza todas las entidades"""
+        platform_index = level.get_platform_index() if level else None
+        
         # Actualizar jugador
         if self.player:
-            self.player.update(platforms)
+            self.player.update(platforms, player_keys, platform_index)
+        
+        player_rect = self.player.rect if self.player else None
+        
+        # Rutas hacia el jugador
+        if level:
+            self.update_navigation(level, player_rect)
+        
+        # Decisiones de IA en lote: una consulta por agente compartido
+        ai_decisions, experiences = self.choose_enemy_actions(player_rect, platforms)
         
-        # Actualizar enemigos y remover inactivos
+        # Actualizar enemigos (la física va en lote si hay almacén) y remover inactivos
+        batched = self.entity_store is not None
+        for enemy in self.enemies:
+            agent = getattr(enemy, 'ai_agent', None)
+            enemy.update(player_rect, platforms, ai_decisions.get(enemy),
+                         experiences.get(agent) if agent else None, platform_index,
+                         physics=not batched)
+        if batched:
+            self.entity_store.step_enemies(self.enemies, platforms)
         for enemy in self.enemies[:]:
-            enemy.update(self.player.rect if self.player else None, platforms)
             if hasattr(enemy, 'active') and not enemy.active:
                 self.enemies.remove(enemy)
+                self.path_scheduler.cancel(enemy)
+        
+        # Aprendizaje en lote
+        for agent, batch in experiences.items():
+            if batch:
+                agent.learn_batch(*zip(*batch))
         
         # Actualizar coleccionables
         for collectible in self.collectibles:
             collectible.update()
         
-        # Actualizar proyectiles
-        for projectile in self.projectiles[:]:
-            projectile.update(self.enemies)
-            if not projectile.active:
-                self.projectiles.remove(projectile)
+        # Actualizar proyectiles (solo contra enemigos cercanos)
+        if batched:
+            self.entity_store.step_projectiles(self.projectiles, self.enemies)
+        else:
+            self.enemy_index.rebuild(self.enemies)
+            for projectile in self.projectiles:
+                projectile.update(self.enemy_index.query(projectile.rect))
+        self.projectiles[:] = [projectile for projectile in self.projectiles if projectile.active]
+    
+    def update_navigation(self, level, player_rect):
+        """Pide rutas para los barriles y reparte el presupuesto de búsqueda del frame"""
+        if not player_rect:
+            return
+        
+        graph = level.get_navigation_graph(max_jump_height("barrel"))
+        goal_pos = (player_rect.centerx, player_rect.bottom)
+        goal = graph.nearest_node(*goal_pos)
+        
+        # Los monstruos comparten un único campo de flujo hacia el jugador, sobre un grafo
+        # que solo tiene los saltos que alcanzan
+        flow_field = level.get_flow_field(max_jump_height("monster"))
+        flow_field.update(goal_pos)
+        
+        for enemy in self.enemies:
+            position = (enemy.rect.centerx, enemy.rect.bottom)
+            if enemy.enemy_type == "monster":
+                step = flow_field.next_step(position)
+                enemy.set_route([step] if step else [], goal)
+                continue
+            
+            # Recalcular solo si el jugador cambió de nodo o la ruta se agotó, y desde el suelo
+            if (enemy.route_goal == goal and enemy.route) or not enemy.on_ground:
+                continue
+            start = graph.nearest_node(*position)
+            route = self.path_scheduler.request(enemy, graph, start, goal)
+            if route is not None:
+                enemy.set_route(route, goal)
+        
+        for enemy, route, route_goal in self.path_scheduler.run():
+            enemy.set_route(route, route_goal)
+    
+    def rebuild_spatial_index(self):
+        """Reconstruye los índices espaciales con las posiciones actuales"""
+        self.enemy_index.rebuild(self.enemies)
+        self.collectible_index.rebuild(self.collectibles)
+    
+    def choose_enemy_actions(self, player_rect, platforms):
+        """Elige las acciones Q-Learning de todos los enemigos agrupadas por agente"""
+        ai_decisions = {}
+        experiences = {}
+        # Sin jugador o plataformas los barriles no consultan la IA
+        if not player_rect or not platforms:
+            return ai_decisions, experiences
+        
+        groups = {}
+        for enemy in self.enemies:
+            agent = getattr(enemy, 'ai_agent', None)
+            if agent:
+                groups.setdefault(agent, []).append(enemy)
+        
+        for agent, enemies in groups.items():
+            states = [enemy.get_state(player_rect) for enemy in enemies]
+            actions = agent.choose_actions(states)
+            for enemy, state, action in zip(enemies, states, actions):
+                ai_decisions[enemy] = (state, action)
+            experiences[agent] = []
+        
+        return ai_decisions, experiences
     
     def spawn_entities(self):
         """Maneja el spawn de entidades"""
@@ -79,7 +185,7 @@ class EntityManager:
         """Genera coleccionables aleatorios"""
         if not level:
             return
-            
+        
         import random
         platforms = level.get_platforms()
         
@@ -125,20 +231,62 @@ class EntityManager:
     
     def clear_all(self):
         """Limpia todas las entidades"""
+        self.path_scheduler.clear()
         self.enemies.clear()
         self.collectibles.clear()
         self.projectiles.clear()
     
-    def render_all(self, screen):
-        """Renderiza todas las entidades"""
+    def store_previous_positions(self):
+        """Guarda la posición de cada entidad antes de un tick (para interpolar el render)"""
+        if self.player:
+            self.player.previous_position = self.player.rect.topleft
+        for entities in (self.enemies, self.collectibles, self.projectiles):
+            for entity in entities:
+                entity.previous_position = entity.rect.topleft
+    
+    def render_bounds(self, entity):
+        """Zona de pantalla que puede pintar una entidad (para el render por rectángulos sucios)"""
+        bounds = entity.rect.inflate(RENDER_MARGIN * 2, RENDER_MARGIN * 2)
+        explosion_rect = entity.get_explosion_rect() if hasattr(entity, 'get_explosion_rect') else None
+        return bounds.union(explosion_rect) if explosion_rect else bounds
+    
+    def render_interpolated(self, entity, screen, alpha):
+        """Dibuja una entidad entre su posición anterior y la actual sin tocar la simulación
+        
+        Retorna la zona de pantalla dibujada.
+        """
+        previous = getattr(entity, 'previous_position', None)
+        current = entity.rect.topleft
+        if (previous is None or alpha >= 1.0 or
+                abs(current[0] - previous[0]) > MAX_INTERPOLATION_DISTANCE or
+                abs(current[1] - previous[1]) > MAX_INTERPOLATION_DISTANCE):
+            # Entidad nueva o teletransportada (respawn, cambio de nivel): sin interpolar
+            entity.render(screen)
+            return self.render_bounds(entity)
+        
+        entity.rect.topleft = (round(previous[0] + (current[0] - previous[0]) * alpha),
+                               round(previous[1] + (current[1] - previous[1]) * alpha))
+        try:
+            entity.render(screen)
+            return self.render_bounds(entity)
+        finally:
+            entity.rect.topleft = current
+    
+    def render_all(self, screen, alpha=1.0):
+        """Renderiza todas las entidades interpoladas entre los dos últimos ticks
+        
+        Retorna las zonas de pantalla dibujadas.
+        """
+        drawn = []
         if self.player:
-            self.player.render(screen)
+            drawn.append(self.render_interpolated(self.player, screen, alpha))
         
         for enemy in self.enemies:
-            enemy.render(screen)
+            drawn.append(self.render_interpolated(enemy, screen, alpha))
         
         for collectible in self.collectibles:
-            collectible.render(screen)
+            drawn.append(self.render_interpolated(collectible, screen, alpha))
         
         for projectile in self.projectiles:
-            projectile.render(screen)
\ No newline at end of file
+            drawn.append(self.render_interpolated(projectile, screen, alpha))
+        return drawn
\ No newline at end of file
@@ -2,17 +2,59 @@
 Gestor de Firebase para persistencia de datos
 """
 
-import requests
 import json
 import os
-from dotenv import load_dotenv
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from src.utils.startup import LazyModule
 
-load_dotenv()
+# Se importa al primer uso (o en segundo plano desde GameManager) para no retrasar el arranque
+requests = LazyModule('requests')
+
+# Tiempo máximo de cada petición HTTP (segundos)
+REQUEST_TIMEOUT = 5
+# Reintentos ante errores de red o del servidor, con espera exponencial
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+# Entradas por página del ranking
+LEADERBOARD_PAGE_SIZE = 10
+# Máximo de puntuaciones por encima que se cuentan al calcular una posición
+RANK_QUERY_LIMIT = 1000
+
+class FirebaseError(Exception):
+    """Respuesta de error de Firebase"""
+
+class FirebaseRequestError(FirebaseError):
+    """Error transitorio de Firebase (5xx o 429): la petición se reintenta"""
+
+def transient_errors():
+    """Errores que vale la pena reintentar (la red o el servidor pueden recuperarse)"""
+    return (FirebaseRequestError, requests.ConnectionError, requests.Timeout)
+
+def check_transient(response):
+    """Lanza FirebaseRequestError si la respuesta indica un error que vale la pena reintentar"""
+    if response.status_code >= 500 or response.status_code == 429:
+        raise FirebaseRequestError(f"HTTP {response.status_code}")
+    return response
 
 class FirebaseManager:
     def __init__(self, config):
         self.config = config
         self.db = None
+        
+        # Cola de peticiones atendida por un hilo en segundo plano (se crea al primer uso)
+        self.jobs = queue.Queue()
+        self.completed = queue.Queue()
+        self.worker = None
+        self.worker_lock = threading.Lock()
+        
+        # Momento del último récord guardado (las cachés del ranking anteriores quedan caducadas)
+        self.last_score_update = 0.0
+        # Última puntuación conocida en el servidor por usuario (evita releerla al calcular la posición)
+        self.known_best_scores = {}
+        
         self.initialize_firebase()
     
     def initialize_firebase(self):
@@ -74,8 +116,82 @@ class FirebaseManager:
             print(f"Error al cargar modelo IA: {e}")
             return {}
     
-    def save_user_best_score(self, user_id, score, email):
-        """Guarda la mejor puntuación del usuario en Realtime Database"""
+    def submit(self, function, *args, callback=None, retries=MAX_RETRIES):
+        """Encola una petición y retorna enseguida un Future con su resultado
+        
+        callback(future) se ejecuta en el hilo del juego desde process_callbacks().
+        """
+        future = Future()
+        with self.worker_lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._worker, name="FirebaseWorker", daemon=True)
+                self.worker.start()
+        self.jobs.put((future, function, args, callback, retries))
+        return future
+    
+    def _worker(self):
+        """Atiende las peticiones en orden, reintentando los errores transitorios"""
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                future, function, args, callback, retries = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                
+                attempt = 0
+                while True:
+                    try:
+                        result = function(*args)
+                    except transient_errors() as e:
+                        if attempt < retries:
+                            delay = RETRY_BACKOFF * 2 ** attempt
+                            attempt += 1
+                            print(f"Error de red con Firebase ({e}), reintento {attempt}/{retries} en {delay:.1f}s")
+                            time.sleep(delay)
+                            continue
+                        print(f"Petición a Firebase fallida tras {retries} reintentos: {e}")
+                        future.set_exception(e)
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(result)
+                    break
+                
+                if callback:
+                    self.completed.put((callback, future))
+            finally:
+                self.jobs.task_done()
+    
+    def process_callbacks(self):
+        """Ejecuta en el hilo del juego los callbacks de las peticiones terminadas"""
+        while True:
+            try:
+                callback, future = self.completed.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback(future)
+            except Exception as e:
+                print(f"Error en callback de Firebase: {e}")
+    
+    def flush(self):
+        """Espera a que terminen las peticiones pendientes"""
+        self.jobs.join()
+    
+    def close(self, timeout=5.0):
+        """Termina el hilo tras enviar lo pendiente (sin bloquear más de timeout)"""
+        if self.worker and self.worker.is_alive():
+            self.jobs.put(None)
+            self.worker.join(timeout)
+    
+    def save_user_best_score(self, user_id, score, email, callback=None):
+        """Encola el guardado de la mejor puntuación; retorna un Future (True si se guardó)"""
+        return self.submit(self._save_user_best_score, user_id, score, email, callback=callback)
+    
+    def _save_user_best_score(self, user_id, score, email):
+        """Guarda la mejor puntuación del usuario en Realtime Database (en el hilo de Firebase)"""
         try:
             print(f"Intentando guardar puntuación: {score} para {email} (ID: {user_id})")
             
@@ -83,7 +199,7 @@ class FirebaseManager:
             get_url = f"{self.database_url}/leaderboard/{user_id}.json"
             
             # Obtener datos actuales
-            response = requests.get(get_url)
+            response = check_transient(requests.get(get_url, timeout=REQUEST_TIMEOUT))
             current_data = response.json() if response.status_code == 200 else None
             
             print(f"Datos actuales: {current_data}")
@@ -91,6 +207,7 @@ class FirebaseManager:
             should_save = False
             if current_data:
                 current_score = current_data.get('best_score', 0)
+                self.known_best_scores[user_id] = current_score
                 if score > current_score:
                     should_save = True
                     print(f"Actualizando: {current_score} -> {score}")
@@ -99,7 +216,6 @@ class FirebaseManager:
                 print("Creando nueva entrada")
             
             if should_save:
-                import time
                 data_to_save = {
                     'user_id': user_id,
                     'email': email,
@@ -109,10 +225,12 @@ class FirebaseManager:
                 
                 # URL para guardar datos
                 put_url = f"{self.database_url}/leaderboard/{user_id}.json"
-                save_response = requests.put(put_url, json=data_to_save)
+                save_response = check_transient(requests.put(put_url, json=data_to_save, timeout=REQUEST_TIMEOUT))
                 
                 if save_response.status_code == 200:
                     print(f"Datos guardados exitosamente: {data_to_save}")
+                    self.known_best_scores[user_id] = score
+                    self.last_score_update = time.time()
                     return True
                 else:
                     print(f"Error al guardar: {save_response.status_code}")
@@ -121,6 +239,9 @@ class FirebaseManager:
                 print(f"No se actualizó: puntuación actual {current_data.get('best_score', 0)} >= nueva {score}")
                 return False
                 
+        except transient_errors():
+            # El hilo de Firebase la reintenta
+            raise
         except Exception as e:
             print(f"Error detallado al guardar: {e}")
             import traceback
@@ -131,7 +252,7 @@ class FirebaseManager:
         """Obtiene la mejor puntuación del usuario"""
         try:
             url = f"{self.database_url}/leaderboard/{user_id}.json"
-            response = requests.get(url)
+            response = requests.get(url, timeout=REQUEST_TIMEOUT)
             if response.status_code == 200:
                 data = response.json()
                 if data:
@@ -141,45 +262,127 @@ class FirebaseManager:
             print(f"Error al obtener mejor puntuación: {e}")
             return 0
     
-    def get_global_leaderboard(self, limit=10):
-        """Obtiene el ranking global"""
+    def get_global_leaderboard(self, limit=LEADERBOARD_PAGE_SIZE):
+        """Obtiene las primeras posiciones del ranking global"""
+        return self.get_leaderboard_page(limit)[0]
+    
+    def get_leaderboard_page(self, limit=LEADERBOARD_PAGE_SIZE, cursor=None):
+        """Página del ranking ordenada y limitada en el servidor (requiere ".indexOn": "best_score")
+        
+        Sin cursor retorna el top; con el cursor de la página anterior, las siguientes
+        posiciones. Retorna (entradas, cursor de la página siguiente o None si no hay más).
+        """
         try:
-            url = f"{self.database_url}/leaderboard.json"
-            response = requests.get(url)
-            
-            leaderboard = []
-            if response.status_code == 200:
-                data = response.json()
-            
-                if data:
-                # Obtener todos los datos y ordenar localmente
-                    for user_id, user_data in data.items():
-                        if isinstance(user_data, dict) and 'best_score' in user_data:
-                            leaderboard.append({
-                                'email': user_data.get('email', 'Anonimo'),
-                                'score': user_data.get('best_score', 0)
-                            })
-                
-                # Ordenar por puntuación descendente y limitar
-                leaderboard.sort(key=lambda x: x['score'], reverse=True)
-                leaderboard = leaderboard[:limit]
-            
-            return leaderboard
+            return self.fetch_leaderboard_page(limit, cursor)
         except Exception as e:
             print(f"Error al obtener ranking: {e}")
-            return []
+            return [], None
+    
+    def fetch_leaderboard_page(self, limit=LEADERBOARD_PAGE_SIZE, cursor=None):
+        """Igual que get_leaderboard_page pero lanza FirebaseError o errores de red en lugar de retornar vacío
+        
+        Pensado para submit(): los errores transitorios se reintentan y los demás llegan al Future.
+        """
+        url = f"{self.database_url}/leaderboard.json"
+        params = {'orderBy': '"best_score"', 'limitToLast': limit}
+        seen = frozenset()
+        if cursor:
+            # endAt incluye los empates con la última puntuación ya mostrada: se piden de más y se descartan
+            score, seen = cursor
+            params['endAt'] = score
+            params['limitToLast'] = limit + len(seen)
+        
+        response = check_transient(requests.get(url, params=params, timeout=REQUEST_TIMEOUT))
+        if response.status_code != 200:
+            raise FirebaseError(f"HTTP {response.status_code} {response.text[:200]}")
+        
+        data = response.json() or {}
+        leaderboard = []
+        for user_id, user_data in data.items():
+            if isinstance(user_data, dict) and 'best_score' in user_data and user_id not in seen:
+                leaderboard.append({
+                    'uid': user_id,
+                    'email': user_data.get('email', 'Anonimo'),
+                    'score': user_data.get('best_score', 0)
+                })
+        
+        # El servidor no garantiza el orden del JSON; a igual puntuación Firebase ordena por clave
+        leaderboard.sort(key=lambda x: (x['score'], x['uid']), reverse=True)
+        leaderboard = leaderboard[:limit]
+        
+        next_cursor = None
+        if leaderboard and len(data) >= params['limitToLast']:
+            last_score = leaderboard[-1]['score']
+            ties = {entry['uid'] for entry in leaderboard if entry['score'] == last_score}
+            if cursor and cursor[0] == last_score:
+                ties |= seen
+            next_cursor = (last_score, frozenset(ties))
+        
+        return leaderboard, next_cursor
+    
+    def get_user_rank(self, user_id, score=None):
+        """Posición del usuario en el ranking contando solo las puntuaciones por encima de la suya
+        
+        Usa el índice de best_score (startAt) en lugar de descargar el ranking completo; la
+        consulta se limita a RANK_QUERY_LIMIT entradas y, si se alcanza, capped indica que rank es
+        solo un mínimo. Retorna {'rank', 'score', 'capped'} o None si no tiene puntuación.
+        """
+        try:
+            return self.fetch_user_rank(user_id, score)
+        except Exception as e:
+            print(f"Error al obtener posición: {e}")
+            return None
+    
+    def fetch_user_rank(self, user_id, score=None):
+        """Igual que get_user_rank pero lanza FirebaseError o errores de red (para submit())
+        
+        Con score (la puntuación del usuario en el servidor, si ya se conoce) basta una petición;
+        sin ella, o si no se conoce por known_best_scores, se lee antes su entrada.
+        """
+        if score is None:
+            score = self.known_best_scores.get(user_id)
+        if score is None:
+            url = f"{self.database_url}/leaderboard/{user_id}.json"
+            response = check_transient(requests.get(url, timeout=REQUEST_TIMEOUT))
+            if response.status_code != 200:
+                raise FirebaseError(f"HTTP {response.status_code} {response.text[:200]}")
+            data = response.json()
+            if not isinstance(data, dict) or 'best_score' not in data:
+                return None
+            score = data['best_score']
+        
+        # Las puntuaciones iguales también cuentan si su clave va antes en el orden del ranking
+        url = f"{self.database_url}/leaderboard.json"
+        params = {'orderBy': '"best_score"', 'startAt': score, 'limitToFirst': RANK_QUERY_LIMIT + 1}
+        response = check_transient(requests.get(url, params=params, timeout=REQUEST_TIMEOUT))
+        if response.status_code != 200:
+            raise FirebaseError(f"HTTP {response.status_code} {response.text[:200]}")
+        
+        data = response.json() or {}
+        above = sum(
+            1 for other_id, other in data.items()
+            if isinstance(other, dict) and other_id != user_id and
+            (other.get('best_score', 0), other_id) > (score, user_id)
+        )
+        capped = len(data) > RANK_QUERY_LIMIT
+        return {'rank': above + 1, 'score': score, 'capped': capped}
+    
+    def save_cloud_game(self, user_id, save_data, callback=None):
+        """Encola el guardado de la partida en la nube; retorna un Future (True si se guardó)"""
+        return self.submit(self._save_cloud_game, user_id, save_data, callback=callback)
     
-    def save_cloud_game(self, user_id, save_data):
-        """Guarda partida en la nube"""
+    def _save_cloud_game(self, user_id, save_data):
+        """Guarda partida en la nube (en el hilo de Firebase)"""
         try:
-            import time
             url = f"{self.database_url}/cloud_saves/{user_id}.json"
             data = {
                 'save_data': save_data,
                 'last_updated': int(time.time())
             }
-            response = requests.put(url, json=data)
+            response = check_transient(requests.put(url, json=data, timeout=REQUEST_TIMEOUT))
             return response.status_code == 200
+        except transient_errors():
+            raise
         except Exception as e:
             print(f"Error al guardar en la nube: {e}")
             return False
@@ -188,7 +391,7 @@ class FirebaseManager:
         """Carga partida de la nube"""
         try:
             url = f"{self.database_url}/cloud_saves/{user_id}.json"
-            response = requests.get(url)
+            response = requests.get(url, timeout=REQUEST_TIMEOUT)
             if response.status_code == 200:
                 data = response.json()
                 if data:
@@ -0,0 +1,141 @@
+"""
+Caché del ranking global: muestra al instante el último ranking conocido y lo revalida en segundo plano
+"""
+
+import json
+import os
+import time
+from src.managers.firebase_manager import LEADERBOARD_PAGE_SIZE, FirebaseError, FirebaseRequestError
+
+CACHE_FILE = "data/cache/leaderboard.json"
+
+class LeaderboardCache:
+    """Primera página del ranking y posición del jugador, persistidas en disco
+    
+    Los datos se sirven aunque estén caducados (stale-while-revalidate); revalidate()
+    los pide al hilo de Firebase y los reemplaza cuando llega la respuesta.
+    """
+    
+    def __init__(self, config, firebase_manager, cache_file=CACHE_FILE):
+        self.config = config
+        self.firebase_manager = firebase_manager
+        self.cache_file = cache_file
+        self.ttl = config.LEADERBOARD_CACHE_TTL
+        
+        self.entries = []
+        self.next_cursor = None
+        self.ranks = {}
+        self.fetched_at = 0.0
+        self.refreshing = None
+        
+        self.load()
+    
+    def load(self):
+        """Carga el último ranking guardado en disco"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r') as f:
+                    data = json.load(f)
+                self.entries = data.get('entries', [])
+                cursor = data.get('next_cursor')
+                self.next_cursor = (cursor[0], frozenset(cursor[1])) if cursor else None
+                self.ranks = data.get('ranks', {})
+                self.fetched_at = data.get('fetched_at', 0.0)
+        except Exception as e:
+            print(f"Error al cargar caché del ranking: {e}")
+    
+    def save(self):
+        """Guarda el ranking en disco (archivo temporal + reemplazo para no dejarlo a medias)"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            cursor = [self.next_cursor[0], sorted(self.next_cursor[1])] if self.next_cursor else None
+            temp_file = self.cache_file + ".tmp"
+            with open(temp_file, 'w') as f:
+                json.dump({
+                    'entries': self.entries,
+                    'next_cursor': cursor,
+                    'ranks': self.ranks,
+                    'fetched_at': self.fetched_at
+                }, f)
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            print(f"Error al guardar caché del ranking: {e}")
+    
+    def has_data(self):
+        """Hay un ranking descargado alguna vez"""
+        return self.fetched_at > 0
+    
+    def is_stale(self, user_id=None):
+        """Caducado por TTL, por un récord guardado después de descargarlo o por no haber
+        consultado la posición de user_id (otro jugador inició sesión)
+        
+        Un jugador sin puntuación en el servidor queda guardado con posición None, así que
+        también espera al TTL.
+        """
+        return (time.time() - self.fetched_at > self.ttl or
+                self.fetched_at < self.firebase_manager.last_score_update or
+                (user_id is not None and user_id not in self.ranks))
+    
+    def get_rank(self, user_id):
+        """Última posición conocida del usuario (None si no se conoce)"""
+        return self.ranks.get(user_id) if user_id else None
+    
+    def is_refreshing(self):
+        """Hay una revalidación en curso"""
+        return self.refreshing is not None and not self.refreshing.done()
+    
+    def revalidate(self, user_id=None, on_update=None, force=False):
+        """Pide el ranking en segundo plano si está caducado
+        
+        on_update() se llama en el hilo del juego cuando los datos nuevos ya están en la caché.
+        Si la petición falla se conservan los anteriores.
+        """
+        if self.is_refreshing() or not (force or self.is_stale(user_id)):
+            return self.refreshing
+        
+        def apply(future):
+            try:
+                entries, next_cursor, rank, rank_known, fetched_at = future.result()
+            except Exception as e:
+                print(f"Error al revalidar ranking: {e}")
+                return
+            self.entries = entries
+            self.next_cursor = next_cursor
+            # None si el jugador no tiene puntuación; si la consulta falló se conservan las anteriores
+            if user_id and rank_known:
+                self.ranks = {user_id: rank}
+            self.fetched_at = fetched_at
+            self.save()
+            if on_update:
+                on_update()
+        
+        self.refreshing = self.firebase_manager.submit(self._fetch, user_id, callback=apply)
+        return self.refreshing
+    
+    def _fetch(self, user_id):
+        """Descarga la primera página y la posición del usuario (en el hilo de Firebase)
+        
+        Retorna (entradas, cursor, posición, posición consultada con éxito, instante de descarga).
+        """
+        fetched_at = time.time()
+        entries, next_cursor = self.firebase_manager.fetch_leaderboard_page(LEADERBOARD_PAGE_SIZE)
+        rank = None
+        rank_known = False
+        if user_id:
+            # Si el jugador está en la primera página su posición ya se conoce; si no, se consulta
+            # (una sola petición si este cliente ya conoce su puntuación)
+            for position, entry in enumerate(entries):
+                if entry['uid'] == user_id:
+                    rank = {'rank': position + 1, 'score': entry['score'], 'capped': False}
+                    rank_known = True
+                    break
+            else:
+                try:
+                    rank = self.firebase_manager.fetch_user_rank(user_id)
+                    rank_known = True
+                except FirebaseRequestError:
+                    # Transitorio: el hilo de Firebase reintenta la revalidación completa
+                    raise
+                except FirebaseError as e:
+                    print(f"Error al obtener posición: {e}")
+        return entries, next_cursor, rank, rank_known, fetched_at
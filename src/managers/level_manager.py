@@ -3,7 +3,7 @@ Gestor de niveles del juego
 """
 
 from src.game.level import Level
-from src.entities.enemy import Enemy
+from src.entities.enemy import Enemy, max_jump_height
 
 class LevelManager:
     def __init__(self, config):
@@ -15,13 +15,18 @@ class LevelManager:
         """Crea un nivel específico o aleatorio"""
         if level_number <= 3:
             if level_number == 1:
-                return self.create_level_1()
+                level, enemies = self.create_level_1()
             elif level_number == 2:
-                return self.create_level_2()
+                level, enemies = self.create_level_2()
             elif level_number == 3:
-                return self.create_level_3()
+                level, enemies = self.create_level_3()
         else:
-            return self.create_random_level(level_number)
+            level, enemies = self.create_random_level(level_number)
+        
+        # Precalcular los grafos de navegación (uno por altura de salto) al cargar el nivel
+        level.get_navigation_graph(max_jump_height("barrel"))
+        level.get_navigation_graph(max_jump_height("monster"))
+        return level, enemies
     
     def create_level_1(self):
         """Primer nivel - Tutorial"""
@@ -108,6 +113,7 @@ class LevelManager:
         
         level.platforms = platforms
         level.ladders = ladders
+        level.invalidate_surface()
         
         # Enemigos basados en dificultad
         num_enemies = min(1 + difficulty // 2, 5)
@@ -4,17 +4,36 @@ Gestor de sonidos del juego
 
 import pygame
 import os
+import threading
 
 class SoundManager:
-    def __init__(self):
-        pygame.mixer.init()
+    def __init__(self, background=True):
         self.sounds = {}
         self.music_volume = 0.7
         self.sfx_volume = 0.8
-        self.load_sounds()
+        
+        # El mezclador (main.py no lo inicia) y los WAV se preparan en segundo plano;
+        # hasta entonces los sonidos se omiten
+        self.loader = None
+        if background:
+            self.loader = threading.Thread(target=self.load_sounds, name="SoundLoader", daemon=True)
+            self.loader.start()
+        else:
+            self.load_sounds()
+    
+    def wait_until_loaded(self, timeout=None):
+        """Espera a que terminen de cargarse los sonidos"""
+        if self.loader and self.loader.is_alive():
+            self.loader.join(timeout)
     
     def load_sounds(self):
-        """Carga todos los sonidos del juego"""
+        """Inicializa el mezclador y carga todos los sonidos del juego"""
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"No se pudo inicializar el audio: {e}")
+            return
+        
         sound_files = {
             'jump': 'jump.wav',
             'damage': 'damage.wav',
@@ -51,7 +70,8 @@ class SoundManager:
     
     def play_music(self, music_name, loop=-1):
         """Reproduce música de fondo"""
-        if music_name in self.sounds:
+        self.wait_until_loaded()
+        if music_name in self.sounds and pygame.mixer.get_init():
             try:
                 pygame.mixer.music.load(self.sounds[music_name])
                 pygame.mixer.music.set_volume(self.music_volume)
@@ -61,16 +81,19 @@ class SoundManager:
     
     def stop_music(self):
         """Detiene la música"""
-        pygame.mixer.music.stop()
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
     
     def set_music_volume(self, volume):
         """Ajusta el volumen de la música (0.0 - 1.0)"""
         self.music_volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(self.music_volume)
+        if pygame.mixer.get_init():
+            pygame.mixer.music.set_volume(self.music_volume)
     
     def set_sfx_volume(self, volume):
         """Ajusta el volumen de efectos (0.0 - 1.0)"""
         self.sfx_volume = max(0.0, min(1.0, volume))
-        for sound_name, sound in self.sounds.items():
+        # Copia: el hilo de carga puede estar añadiendo sonidos
+        for sound_name, sound in list(self.sounds.items()):
             if sound and hasattr(sound, 'set_volume'):
                 sound.set_volume(self.sfx_volume)
\ No newline at end of file
@@ -3,6 +3,7 @@ Gestor de tutorial - Maneja la lógica y renderizado del tutorial
 """
 
 import pygame
+from src.utils.text_cache import get_font
 
 class TutorialManager:
     def __init__(self, config):
@@ -40,7 +41,7 @@ class TutorialManager:
         if not self.active:
             return
             
-        font = pygame.font.Font(None, 36)
+        font = get_font(36)
         
         # Indicador del personaje
         if player:
@@ -2,7 +2,9 @@
 Gestor de interfaz de usuario - Maneja todos los menús y pantallas
 """
 
-import pygame
+from functools import cached_property
+from src.utils.asset_cache import get_overlay
+from src.utils.text_cache import get_font
 
 class UIManager:
     def __init__(self, config, auth_manager, firebase_manager, save_manager, sound_manager):
@@ -12,23 +14,46 @@ class UIManager:
         self.save_manager = save_manager
         self.sound_manager = sound_manager
         
-        # Importar menús
-        from src.ui.menu import Menu
+        # Fondo del juego congelado bajo los menús superpuestos
+        self.frozen_background = None
+        self.frozen_key = None
+    
+    # Los menús se importan y construyen la primera vez que se usan (con sus imágenes y fuentes)
+    
+    @cached_property
+    def login_menu(self):
         from src.ui.login_menu import LoginMenu
+        return LoginMenu(self.config)
+    
+    @cached_property
+    def menu(self):
+        from src.ui.menu import Menu
+        return Menu(self.config, self.save_manager, self.auth_manager)
+    
+    @cached_property
+    def color_selector(self):
         from src.ui.color_selector import ColorSelector
+        return ColorSelector(self.config)
+    
+    @cached_property
+    def pause_menu(self):
         from src.ui.pause_menu import PauseMenu
+        return PauseMenu(self.config)
+    
+    @cached_property
+    def save_menu(self):
         from src.ui.save_menu import SaveMenu
+        return SaveMenu(self.config)
+    
+    @cached_property
+    def settings_menu(self):
         from src.ui.settings_menu import SettingsMenu
+        return SettingsMenu(self.config, self.sound_manager)
+    
+    @cached_property
+    def leaderboard_menu(self):
         from src.ui.leaderboard_menu import LeaderboardMenu
-        
-        # Inicializar menús
-        self.login_menu = LoginMenu(config)
-        self.menu = Menu(config, save_manager, auth_manager)
-        self.color_selector = ColorSelector(config)
-        self.pause_menu = PauseMenu(config)
-        self.save_menu = SaveMenu(config)
-        self.settings_menu = SettingsMenu(config, sound_manager)
-        self.leaderboard_menu = LeaderboardMenu(config, firebase_manager, auth_manager)
+        return LeaderboardMenu(self.config, self.firebase_manager, self.auth_manager)
     
     def handle_login_events(self, event):
         """Maneja eventos del menú de login"""
@@ -151,6 +176,9 @@ class UIManager:
     
     def render_ui(self, screen, state, game_data=None):
         """Renderiza la interfaz según el estado"""
+        if state not in ("PAUSED", "SAVE_MENU", "LEVEL_COMPLETE", "LIFE_LOST"):
+            self.clear_frozen_background()
+        
         if state == "LOGIN":
             self.login_menu.render(screen)
         elif state == "MENU":
@@ -162,20 +190,42 @@ class UIManager:
         elif state == "LEADERBOARD":
             self.leaderboard_menu.render(screen)
         elif state == "PAUSED":
-            self._render_game_background(screen, game_data)
+            self._render_frozen_game_background(screen, state, game_data)
             self.pause_menu.render(screen)
         elif state == "SAVE_MENU":
-            self._render_game_background(screen, game_data)
+            self._render_frozen_game_background(screen, state, game_data)
             self.save_menu.render(screen)
         elif state == "GAME_OVER":
             self._render_game_over(screen)
         elif state == "LEVEL_COMPLETE":
-            self._render_game_background(screen, game_data)
+            self._render_frozen_game_background(screen, state, game_data)
             self._render_level_complete(screen, game_data)
         elif state == "LIFE_LOST":
-            self._render_game_background(screen, game_data)
+            self._render_frozen_game_background(screen, state, game_data)
             self._render_life_lost(screen, game_data)
     
+    def render_frozen_background(self, screen, key, draw_background):
+        """Dibuja el fondo una vez al entrar en un estado (o si cambia key) y luego reutiliza la captura"""
+        if self.frozen_background is not None and key == self.frozen_key:
+            screen.blit(self.frozen_background, (0, 0))
+            return
+        
+        draw_background(screen)
+        if self.frozen_background is None or self.frozen_background.get_size() != screen.get_size():
+            self.frozen_background = screen.copy()
+        else:
+            self.frozen_background.blit(screen, (0, 0))
+        self.frozen_key = key
+    
+    def clear_frozen_background(self):
+        """Olvida la captura: el próximo menú superpuesto volverá a dibujar el juego"""
+        self.frozen_key = None
+    
+    def _render_frozen_game_background(self, screen, state, game_data):
+        """Fondo del juego congelado mientras el juego está detenido en este estado"""
+        self.render_frozen_background(screen, state,
+                                      lambda surface: self._render_game_background(surface, game_data))
+    
     def _render_game_background(self, screen, game_data):
         """Renderiza el fondo del juego"""
         if not game_data:
@@ -194,12 +244,12 @@ class UIManager:
     
     def _render_game_over(self, screen):
         """Renderiza pantalla de game over"""
-        font = pygame.font.Font(None, 74)
+        font = get_font(74)
         text = font.render("GAME OVER", True, self.config.COLORS['RED'])
         text_rect = text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 - 50))
         screen.blit(text, text_rect)
         
-        font_small = pygame.font.Font(None, 36)
+        font_small = get_font(36)
         restart_text = font_small.render("Presiona R para reintentar", True, self.config.COLORS['WHITE'])
         restart_rect = restart_text.get_rect(center=(self.config.WINDOW_WIDTH//2, self.config.WINDOW_HEIGHT//2 + 20))
         screen.blit(restart_text, restart_rect)
@@ -210,13 +260,11 @@ class UIManager:
     
     def _render_level_complete(self, screen, game_data):
         """Renderiza pantalla de nivel completado"""
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 0))
+        overlay = get_overlay((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), (0, 0, 0), 150)
         screen.blit(overlay, (0, 0))
         
-        font_large = pygame.font.Font(None, 74)
-        font_medium = pygame.font.Font(None, 48)
+        font_large = get_font(74)
+        font_medium = get_font(48)
         
         title = font_large.render("¡NIVEL COMPLETADO!", True, self.config.COLORS['YELLOW'])
         title_rect = title.get_rect(center=(self.config.WINDOW_WIDTH//2, 200))
@@ -233,13 +281,11 @@ class UIManager:
     
     def _render_life_lost(self, screen, game_data):
         """Renderiza pantalla de vida perdida"""
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((255, 0, 0))
+        overlay = get_overlay((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), (255, 0, 0), 150)
         screen.blit(overlay, (0, 0))
         
-        font_large = pygame.font.Font(None, 74)
-        font_medium = pygame.font.Font(None, 48)
+        font_large = get_font(74)
+        font_medium = get_font(48)
         
         title = font_large.render("¡VIDA PERDIDA!", True, self.config.COLORS['WHITE'])
         title_rect = title.get_rect(center=(self.config.WINDOW_WIDTH//2, 200))
@@ -1,9 +1,19 @@
 # Interfaz de usuario
-from .menu import Menu
-from .login_menu import LoginMenu
-from .leaderboard_menu import LeaderboardMenu
-from .color_selector import ColorSelector
-from .pause_menu import PauseMenu
-from .save_menu import SaveMenu
-from .settings_menu import SettingsMenu
-from .shop_menu import ShopMenu
\ No newline at end of file
+# Los menús se importan al pedirlos (UIManager los construye la primera vez que se usan)
+import importlib
+
+_EXPORTS = {
+    'Menu': '.menu',
+    'LoginMenu': '.login_menu',
+    'LeaderboardMenu': '.leaderboard_menu',
+    'ColorSelector': '.color_selector',
+    'PauseMenu': '.pause_menu',
+    'SaveMenu': '.save_menu',
+    'SettingsMenu': '.settings_menu',
+    'ShopMenu': '.shop_menu',
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -3,12 +3,13 @@ Selector de color para el jugador
 """
 
 import pygame
+from src.utils.text_cache import get_font
 
 class ColorSelector:
     def __init__(self, config):
         self.config = config
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
+        self.font = get_font(48)
+        self.small_font = get_font(36)
         self.selected_color = 0
         self.color_selected = False
         
@@ -3,42 +3,118 @@ Menú de ranking/leaderboard
 """
 
 import pygame
+from src.utils.text_cache import get_font
+from src.managers.firebase_manager import LEADERBOARD_PAGE_SIZE
+from src.managers.leaderboard_cache import LeaderboardCache
 
 class LeaderboardMenu:
     def __init__(self, config, firebase_manager, auth_manager):
         self.config = config
         self.firebase_manager = firebase_manager
         self.auth_manager = auth_manager
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
-        self.tiny_font = pygame.font.Font(None, 24)
+        self.font = get_font(48)
+        self.small_font = get_font(36)
+        self.tiny_font = get_font(24)
         
         self.leaderboard_data = []
-        self.loading = True
         self.back_to_menu = False
         
-        # Cargar datos
-        self.load_leaderboard()
+        # Último ranking conocido (en disco); se muestra al instante y se revalida en segundo plano
+        self.cache = LeaderboardCache(config, firebase_manager)
+        
+        # Páginas ya descargadas (se piden al servidor solo al avanzar)
+        self.pages = []
+        self.page_index = 0
+        self.next_cursor = None
+        self.page_request = None
+        
+        # Posición del jugador conectado (aunque no esté en la página visible)
+        self.user_rank = None
+        self.show_cached_leaderboard()
     
     def load_leaderboard(self):
-        """Carga el ranking desde Firebase"""
-        self.loading = True
-        self.leaderboard_data = []
-        try:
-            print("Cargando ranking desde Firebase...")
-            self.leaderboard_data = self.firebase_manager.get_global_leaderboard(10)
-            print(f"Ranking cargado: {len(self.leaderboard_data)} entradas")
-            self.loading = False
-        except Exception as e:
-            print(f"Error cargando ranking: {e}")
-            self.loading = False
-            self.leaderboard_data = []
+        """Muestra el ranking en caché y, si está caducado, lo revalida sin bloquear
+        
+        Se llama al abrir el menú; construirlo no hace peticiones.
+        """
+        self.show_cached_leaderboard()
+        self.cache.revalidate(self.get_user_id(), on_update=self.on_cache_updated)
+    
+    def get_user_id(self):
+        """ID del jugador conectado (None si no hay sesión)"""
+        if self.auth_manager and self.auth_manager.is_logged_in():
+            return self.auth_manager.get_user_id()
+        return None
+    
+    def show_cached_leaderboard(self):
+        """Vuelve a la primera página con los datos de la caché"""
+        self.pages = [self.cache.entries]
+        self.page_index = 0
+        self.next_cursor = self.cache.next_cursor
+        self.page_request = None
+        self.leaderboard_data = self.cache.entries
+        self.user_rank = self.cache.get_rank(self.get_user_id())
+    
+    def on_cache_updated(self):
+        """Llega la revalidación: se cambian los datos si se está viendo la primera página"""
+        if self.page_index == 0:
+            self.show_cached_leaderboard()
+        else:
+            # Las páginas siguientes siguen siendo las ya descargadas hasta volver a entrar
+            self.pages[0] = self.cache.entries
+            self.user_rank = self.cache.get_rank(self.get_user_id())
+    
+    def load_page(self, index):
+        """Muestra la página indicada; si es la siguiente a las descargadas la pide en segundo plano"""
+        if index < len(self.pages):
+            self.page_index = index
+            self.leaderboard_data = self.pages[index]
+            return
+        if index != len(self.pages) or self.next_cursor is None or self.page_request is not None:
+            return
+        
+        print(f"Cargando página {index + 1} del ranking desde Firebase...")
+        
+        def show_page(future):
+            # Descartar respuestas de una carga anterior del ranking
+            if self.page_request is not future:
+                return
+            self.page_request = None
+            try:
+                entries, next_cursor = future.result()
+            except Exception as e:
+                print(f"Error cargando ranking: {e}")
+                return
+            print(f"Ranking cargado: {len(entries)} entradas")
+            self.next_cursor = next_cursor
+            # Una página vacía significa que no hay más
+            if entries:
+                self.pages.append(entries)
+                self.page_index = index
+                self.leaderboard_data = entries
+        
+        self.page_request = self.firebase_manager.submit(
+            self.firebase_manager.fetch_leaderboard_page, LEADERBOARD_PAGE_SIZE, self.next_cursor,
+            callback=show_page
+        )
+    
+    def is_loading(self):
+        """Esperando una página, o el primer ranking cuando aún no hay nada en caché"""
+        return self.page_request is not None or (not self.cache.has_data() and self.cache.is_refreshing())
+    
+    def has_next_page(self):
+        """Hay una página siguiente descargada o por descargar"""
+        return self.page_index + 1 < len(self.pages) or self.next_cursor is not None
     
     def handle_event(self, event):
         """Maneja eventos del menú"""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
                 self.back_to_menu = True
+            elif event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN) and self.has_next_page():
+                self.load_page(self.page_index + 1)
+            elif event.key in (pygame.K_LEFT, pygame.K_PAGEUP) and self.page_index > 0:
+                self.load_page(self.page_index - 1)
     
     def render(self, screen):
         """Renderiza el ranking"""
@@ -47,7 +123,7 @@ class LeaderboardMenu:
         title_rect = title.get_rect(center=(self.config.WINDOW_WIDTH//2, 80))
         screen.blit(title, title_rect)
         
-        if self.loading:
+        if self.is_loading():
             loading_text = self.small_font.render("Cargando...", True, self.config.COLORS['WHITE'])
             loading_rect = loading_text.get_rect(center=(self.config.WINDOW_WIDTH//2, 300))
             screen.blit(loading_text, loading_rect)
@@ -70,12 +146,14 @@ class LeaderboardMenu:
             pygame.draw.line(screen, self.config.COLORS['WHITE'], (150, 170), (650, 170), 2)
             
             # Datos del ranking
+            first_position = self.page_index * LEADERBOARD_PAGE_SIZE
             for i, entry in enumerate(self.leaderboard_data):
-                y_pos = 190 + i * 35
+                y_pos = 190 + i * 30
+                position = first_position + i
                 
                 # Posición
-                pos_color = self.config.COLORS['YELLOW'] if i < 3 else self.config.COLORS['WHITE']
-                pos_text = self.small_font.render(f"{i+1}", True, pos_color)
+                pos_color = self.config.COLORS['YELLOW'] if position < 3 else self.config.COLORS['WHITE']
+                pos_text = self.small_font.render(f"{position+1}", True, pos_color)
                 screen.blit(pos_text, (160, y_pos))
                 
                 # Email (truncado si es muy largo)
@@ -85,7 +163,7 @@ class LeaderboardMenu:
                 
                 # Resaltar usuario actual
                 email_color = self.config.COLORS['GREEN'] if (self.auth_manager.is_logged_in() and 
-                                                            email.startswith(self.auth_manager.get_user_email()[:17])) else self.config.COLORS['WHITE']
+                                                            entry.get('uid') == self.auth_manager.get_user_id()) else self.config.COLORS['WHITE']
                 email_text = self.small_font.render(email, True, email_color)
                 screen.blit(email_text, (250, y_pos))
                 
@@ -93,15 +171,26 @@ class LeaderboardMenu:
                 score_text = self.small_font.render(f"{entry['score']:,}", True, self.config.COLORS['WHITE'])
                 screen.blit(score_text, (500, y_pos))
         
+        # Tu posición en el ranking global
+        if self.user_rank:
+            rank = f"{self.user_rank['rank']:,}" + ("+" if self.user_rank['capped'] else "")
+            rank_text = self.small_font.render(f"Tu posición: {rank} ({self.user_rank['score']:,} puntos)", True, self.config.COLORS['GREEN'])
+            rank_rect = rank_text.get_rect(center=(self.config.WINDOW_WIDTH//2, 495))
+            screen.blit(rank_text, rank_rect)
+        
         # Tu mejor puntuación local
         if self.auth_manager:
             local_best = self.auth_manager.get_best_score()
             if local_best > 0:
-                your_score_text = self.small_font.render(f"Tu mejor puntuación local: {local_best:,}", True, self.config.COLORS['YELLOW'])
-                your_score_rect = your_score_text.get_rect(center=(self.config.WINDOW_WIDTH//2, 500))
+                your_score_text = self.tiny_font.render(f"Tu mejor puntuación local: {local_best:,}", True, self.config.COLORS['YELLOW'])
+                your_score_rect = your_score_text.get_rect(center=(self.config.WINDOW_WIDTH//2, 525))
                 screen.blit(your_score_text, your_score_rect)
         
         # Instrucciones
-        instruction = self.tiny_font.render("ESC o ENTER para volver al menú", True, self.config.COLORS['WHITE'])
+        if self.page_index > 0 or self.has_next_page():
+            instruction_text = f"Página {self.page_index + 1}  -  ←/→ cambiar página  -  ESC o ENTER para volver al menú"
+        else:
+            instruction_text = "ESC o ENTER para volver al menú"
+        instruction = self.tiny_font.render(instruction_text, True, self.config.COLORS['WHITE'])
         instruction_rect = instruction.get_rect(center=(self.config.WINDOW_WIDTH//2, 550))
         screen.blit(instruction, instruction_rect)
\ No newline at end of file
@@ -3,13 +3,14 @@ Menú de inicio de sesión
 """
 
 import pygame
+from src.utils.text_cache import get_font
 
 class LoginMenu:
     def __init__(self, config):
         self.config = config
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
-        self.tiny_font = pygame.font.Font(None, 24)
+        self.font = get_font(48)
+        self.small_font = get_font(36)
+        self.tiny_font = get_font(24)
         
         self.state = "MAIN"  # MAIN, LOGIN, REGISTER
         self.selected_option = 0
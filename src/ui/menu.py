@@ -3,16 +3,20 @@ Menú principal del juego
 """
 
 import pygame
+from src.utils.asset_cache import load_image
+from src.utils.text_cache import get_font
+
+MENU_IMAGE_PATH = "assets/images/menu_background.png"
 
 class Menu:
     def __init__(self, config, save_manager, auth_manager=None):
         self.config = config
         self.save_manager = save_manager
         self.auth_manager = auth_manager
-        self.font_large = pygame.font.Font(None, 74)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
-        self.tiny_font = pygame.font.Font(None, 24)
+        self.font_large = get_font(74)
+        self.font_medium = get_font(48)
+        self.small_font = get_font(36)
+        self.tiny_font = get_font(24)
         self.start_game = False
         self.continue_game = False
         self.show_settings = False
@@ -25,12 +29,8 @@ class Menu:
         self.update_options()
         
         # Cargar imagen del menú
-        self.menu_image = None
-        try:
-            self.menu_image = pygame.image.load("assets/images/menu_background.png")
-            self.menu_image = pygame.transform.scale(self.menu_image, (config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
-        except:
-            pass  # Si no existe la imagen, continuar sin ella
+        # Si no existe la imagen, continuar sin ella
+        self.menu_image = load_image(MENU_IMAGE_PATH, (config.WINDOW_WIDTH, config.WINDOW_HEIGHT), alpha=False)
     
     def update_options(self):
         """Actualiza las opciones según el estado del juego"""
@@ -3,11 +3,13 @@ Menú de pausa del juego
 """
 
 import pygame
+from src.utils.asset_cache import get_overlay
+from src.utils.text_cache import get_font
 
 class PauseMenu:
     def __init__(self, config):
         self.config = config
-        self.font = pygame.font.Font(None, 48)
+        self.font = get_font(48)
         self.selected_option = 0
         self.options = ["Reanudar", "Salir al Menú"]
         self.action = None
@@ -30,9 +32,7 @@ class PauseMenu:
     def render(self, screen):
         """Renderiza el menú de pausa"""
         # Fondo semi-transparente
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
+        overlay = get_overlay((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), (0, 0, 0), 128)
         screen.blit(overlay, (0, 0))
         
         # Título
@@ -3,12 +3,14 @@ Menú de guardado del juego
 """
 
 import pygame
+from src.utils.asset_cache import get_overlay
+from src.utils.text_cache import get_font
 
 class SaveMenu:
     def __init__(self, config):
         self.config = config
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
+        self.font = get_font(48)
+        self.small_font = get_font(36)
         self.selected_option = 0
         self.options = ["Guardar y Salir", "Salir sin Guardar", "Cancelar"]
         self.action = None
@@ -33,9 +35,7 @@ class SaveMenu:
     def render(self, screen):
         """Renderiza el menú de guardado"""
         # Fondo semi-transparente
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 0))
+        overlay = get_overlay((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), (0, 0, 0), 150)
         screen.blit(overlay, (0, 0))
         
         # Título
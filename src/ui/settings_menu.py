@@ -3,13 +3,14 @@ Menú de configuración de audio
 """
 
 import pygame
+from src.utils.text_cache import get_font
 
 class SettingsMenu:
     def __init__(self, config, sound_manager):
         self.config = config
         self.sound_manager = sound_manager
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
+        self.font = get_font(48)
+        self.small_font = get_font(36)
         self.selected_option = 0
         self.options = ["Volumen Música", "Volumen Efectos", "Volver"]
         self.music_volume = int(sound_manager.music_volume * 10)
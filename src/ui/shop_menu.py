@@ -3,13 +3,14 @@ Menú de tienda para comprar items
 """
 
 import pygame
-import os
+from src.utils.asset_cache import load_image, get_overlay
+from src.utils.text_cache import get_font
 
 class ShopMenu:
     def __init__(self, config):
         self.config = config
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
+        self.font = get_font(48)
+        self.small_font = get_font(36)
         self.selected_option = 0
         self.items = [
             {"name": "Banana Explosiva", "cost": 50, "description": "Elimina enemigos"},
@@ -53,22 +54,16 @@ class ShopMenu:
         }
         
         for item_id, path in item_paths.items():
-            if os.path.exists(path):
-                try:
-                    image = pygame.image.load(path)
-                    image = pygame.transform.scale(image, (40, 40))
-                    images[item_id] = image
-                except:
-                    pass
+            image = load_image(path, (40, 40))
+            if image:
+                images[item_id] = image
         
         return images
     
     def render(self, screen, player, shop_manager=None):
         """Renderiza el menú de tienda"""
         # Fondo semi-transparente
-        overlay = pygame.Surface((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 100))
+        overlay = get_overlay((self.config.WINDOW_WIDTH, self.config.WINDOW_HEIGHT), (0, 0, 100), 150)
         screen.blit(overlay, (0, 0))
         
         # Título
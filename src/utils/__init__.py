@@ -1,6 +1,16 @@
 # Utilidades del juego
-from ..managers.auth_manager import AuthManager
-from ..managers.firebase_manager import FirebaseManager
-from ..managers.sound_manager import SoundManager
-from ..managers.save_manager import SaveManager
-from .config import Config
\ No newline at end of file
+# Los re-exportes se importan al pedirlos: usar una utilidad no carga los managers (ni requests)
+import importlib
+
+_EXPORTS = {
+    'AuthManager': '..managers.auth_manager',
+    'FirebaseManager': '..managers.firebase_manager',
+    'SoundManager': '..managers.sound_manager',
+    'SaveManager': '..managers.save_manager',
+    'Config': '.config',
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Caché de imágenes compartida por todo el proceso
+"""
+
+import os
+import threading
+import pygame
+
+# (ruta, tamaño, alfa) -> superficie escalada (None si no existe o no se pudo cargar)
+_images = {}
+# Claves cargadas antes de que existiera la ventana; se convierten al pedirlas
+_unconverted = set()
+# (rutas, tamaño) -> SpriteSheet con los frames hacia ambos lados
+_sheets = {}
+# (tamaño, color, alfa) -> capa semitransparente para menús superpuestos
+_overlays = {}
+# Claves que otro hilo está leyendo de disco -> evento que se activa al terminar
+_loading = {}
+_cache_lock = threading.Lock()
+
+class SpriteSheet:
+    """Frames de una animación y sus versiones volteadas en un único atlas
+    
+    La fila superior del atlas mira a la derecha y la inferior a la izquierda; los frames
+    son subsuperficies, así que dibujar en cualquier dirección no crea superficies nuevas.
+    """
+    
+    def __init__(self, frames, alpha=True):
+        width, height = frames[0].get_size()
+        atlas = pygame.Surface((width * len(frames), height * 2), pygame.SRCALPHA if alpha else 0)
+        for i, frame in enumerate(frames):
+            atlas.blit(frame, (i * width, 0))
+            atlas.blit(pygame.transform.flip(frame, True, False), (i * width, height))
+        if _can_convert():
+            atlas = _convert(atlas, alpha)
+        self.converted = _can_convert()
+        
+        self.atlas = atlas
+        self.right = [atlas.subsurface((i * width, 0, width, height)) for i in range(len(frames))]
+        self.left = [atlas.subsurface((i * width, height, width, height)) for i in range(len(frames))]
+    
+    def __len__(self):
+        return len(self.right)
+    
+    def __getitem__(self, index):
+        return self.right[index]
+    
+    def frame(self, index, direction=1):
+        """Frame de la animación mirando en la dirección indicada (1 derecha, -1 izquierda)"""
+        return self.left[index] if direction == -1 else self.right[index]
+
+def _load(path, size):
+    """Carga y escala una imagen desde disco"""
+    if not os.path.exists(path):
+        return None
+    try:
+        image = pygame.image.load(path)
+        if size:
+            image = pygame.transform.scale(image, size)
+        return image
+    except Exception as e:
+        print(f"Error al cargar imagen {path}: {e}")
+        return None
+
+def _can_convert():
+    """La conversión necesita la ventana creada y se hace en el hilo principal"""
+    return pygame.display.get_surface() is not None and threading.current_thread() is threading.main_thread()
+
+def _convert(image, alpha):
+    """Convierte al formato de la pantalla para acelerar los blits"""
+    return image.convert_alpha() if alpha else image.convert()
+
+def load_image(path, size=None, alpha=True):
+    """Imagen escalada y convertida; se lee de disco una sola vez por (ruta, tamaño)"""
+    key = (path, tuple(size) if size else None, alpha)
+    with _cache_lock:
+        if key in _images:
+            image = _images[key]
+            if key in _unconverted and _can_convert():
+                image = _images[key] = _convert(image, alpha)
+                _unconverted.discard(key)
+            return image
+        loading = _loading.get(key)
+        if loading is None:
+            loading = _loading[key] = threading.Event()
+            owner = True
+        else:
+            owner = False
+    
+    if not owner:
+        # Otro hilo (la precarga) ya la está leyendo: esperar y usar la suya
+        loading.wait()
+        return load_image(path, size, alpha)
+    
+    # Leer de disco fuera del candado para no bloquear otras imágenes
+    try:
+        image = _load(path, key[1])
+        with _cache_lock:
+            if image is not None:
+                if _can_convert():
+                    image = _convert(image, alpha)
+                else:
+                    _unconverted.add(key)
+            _images[key] = image
+        return image
+    finally:
+        with _cache_lock:
+            _loading.pop(key, None)
+        loading.set()
+
+def load_images(paths, size=None, alpha=True):
+    """Carga varias imágenes y omite las que no existen"""
+    images = [load_image(path, size, alpha) for path in paths]
+    return [image for image in images if image is not None]
+
+def load_sprite_sheet(paths, size=None, alpha=True):
+    """Atlas compartido con los frames que existan de una animación (None si no hay ninguno)"""
+    key = (tuple(paths), tuple(size) if size else None, alpha)
+    with _cache_lock:
+        sheet = _sheets.get(key, False)
+    # Un atlas creado antes de tener ventana se rehace para convertirlo
+    if sheet is not False and (sheet is None or sheet.converted or not _can_convert()):
+        return sheet
+    
+    frames = load_images(paths, size, alpha)
+    sheet = SpriteSheet(frames, alpha) if frames else None
+    with _cache_lock:
+        _sheets[key] = sheet
+    return sheet
+
+def get_overlay(size, color, alpha):
+    """Capa de un color con transparencia, creada una sola vez por (tamaño, color, alfa)"""
+    key = (tuple(size), tuple(color), alpha)
+    overlay = _overlays.get(key)
+    if overlay is None:
+        overlay = pygame.Surface(key[0])
+        overlay.fill(key[1])
+        overlay.set_alpha(alpha)
+        if _can_convert():
+            overlay = overlay.convert()
+            overlay.set_alpha(alpha)
+        _overlays[key] = overlay
+    return overlay
+
+def preload_images(requests, background=True):
+    """Carga por adelantado una lista de (ruta, tamaño[, alfa]); en segundo plano retorna el hilo"""
+    def worker():
+        for request in requests:
+            load_image(*request)
+    
+    if not background:
+        worker()
+        return None
+    thread = threading.Thread(target=worker, name="AssetPreloader", daemon=True)
+    thread.start()
+    return thread
+
+def clear_image_cache():
+    """Vacía la caché (las imágenes se recargarán al pedirlas)"""
+    with _cache_lock:
+        _images.clear()
+        _unconverted.clear()
+        _sheets.clear()
+        _overlays.clear()
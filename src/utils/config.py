@@ -5,14 +5,30 @@ Configuración del juego y manejo de variables de entorno
 import os
 from dotenv import load_dotenv
 
+_env_loaded = False
+
+def load_environment():
+    """Lee el .env una sola vez por proceso (Config lo llama antes de crear cualquier manager)"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
 class Config:
     def __init__(self):
-        load_dotenv()
+        load_environment()
         
         # Configuración de pantalla
         self.WINDOW_WIDTH = int(os.getenv('WINDOW_WIDTH', 800))
         self.WINDOW_HEIGHT = int(os.getenv('WINDOW_HEIGHT', 600))
-        self.FPS = int(os.getenv('FPS', 60))
+        self.FPS = int(os.getenv('FPS', 60))  # Límite de render (0 = sin límite)
+        
+        # Simulación a paso fijo: las constantes de física y los timers asumen 60 ticks/s
+        self.TICK_RATE = int(os.getenv('TICK_RATE', 60))
+        self.MAX_TICKS_PER_FRAME = int(os.getenv('MAX_TICKS_PER_FRAME', 5))
+        
+        # Render por rectángulos sucios durante la partida (False = pantalla completa cada frame)
+        self.DIRTY_RECT_RENDERING = os.getenv('DIRTY_RECT_RENDERING', 'False').lower() == 'true'
         
         # Configuración de Firebase
         self.firebase_config = {
@@ -31,6 +47,18 @@ class Config:
         # Configuración del juego
         self.DEBUG_MODE = os.getenv('DEBUG_MODE', 'False').lower() == 'true'
         
+        # Configuración de IA
+        # Tabla Q densa con NumPy durante el juego (opcional: actualiza en lote y agrupa dirección y suelo
+        # en dos valores); train.py --workers la usa siempre
+        self.DENSE_Q_TABLE = os.getenv('DENSE_Q_TABLE', 'False').lower() == 'true'
+        
+        # Física de enemigos y proyectiles en lote con NumPy: copia el estado a arrays y de vuelta
+        # cada tick, así que solo compensa con miles de entidades (con las del juego no gana nada)
+        self.SOA_ENTITIES = os.getenv('SOA_ENTITIES', 'False').lower() == 'true'
+        
+        # Segundos que el ranking guardado en caché se considera vigente antes de revalidarlo
+        self.LEADERBOARD_CACHE_TTL = int(os.getenv('LEADERBOARD_CACHE_TTL', 60))
+        
         # Colores
         self.COLORS = {
             'BLACK': (0, 0, 0),
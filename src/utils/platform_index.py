@@ -0,0 +1,66 @@
+"""
+Índice estático de plataformas por columnas para consultas de suelo y bordes
+"""
+
+from bisect import bisect_left, bisect_right
+
+class PlatformIndex:
+    """Agrupa las plataformas por columnas y las ordena por su borde superior"""
+    
+    def __init__(self, platforms, column_width=32):
+        self.platforms = list(platforms)
+        self.column_width = column_width
+        self.max_height = max((platform.height for platform in self.platforms), default=0)
+        
+        # Cada columna guarda (tops ordenados, posiciones en self.platforms)
+        buckets = {}
+        for position, platform in enumerate(self.platforms):
+            if platform.width <= 0:
+                continue
+            # El borde derecho cuenta como parte de la plataforma (igual que las búsquedas lineales)
+            for column in range(platform.left // column_width, platform.right // column_width + 1):
+                buckets.setdefault(column, []).append((platform.top, position))
+        
+        self.columns = {}
+        for column, entries in buckets.items():
+            entries.sort()
+            self.columns[column] = ([top for top, _ in entries], [position for _, position in entries])
+    
+    def below_position(self, x, y):
+        """Posición de la plataforma más alta que cubre x con el borde superior en y o más abajo"""
+        column = self.columns.get(x // self.column_width)
+        if not column:
+            return None
+        tops, positions = column
+        for i in range(bisect_left(tops, y), len(tops)):
+            platform = self.platforms[positions[i]]
+            if platform.left <= x <= platform.right:
+                return positions[i]
+        return None
+    
+    def below(self, x, y):
+        """Plataforma más alta que cubre x con el borde superior en y o más abajo (o None)"""
+        position = self.below_position(x, y)
+        return self.platforms[position] if position is not None else None
+    
+    def at(self, x, y, above=10, below=10):
+        """Plataforma que cubre x con el borde superior entre y - above e y + below (o None)"""
+        platform = self.below(x, y - above)
+        if platform is not None and platform.top <= y + below:
+            return platform
+        return None
+    
+    def query(self, rect):
+        """Plataformas que pueden solaparse con un rectángulo, en el orden original"""
+        width = self.column_width
+        found = set()
+        for column in range(rect.left // width, max(rect.left, rect.right - 1) // width + 1):
+            entries = self.columns.get(column)
+            if not entries:
+                continue
+            tops, positions = entries
+            # Solo las que empiezan por encima del borde inferior y pueden llegar al superior
+            start = bisect_left(tops, rect.top - self.max_height)
+            end = bisect_right(tops, rect.bottom)
+            found.update(positions[start:end])
+        return [self.platforms[position] for position in sorted(found)]
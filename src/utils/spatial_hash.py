@@ -0,0 +1,57 @@
+"""
+Rejilla uniforme (spatial hash) para la fase amplia de colisiones
+"""
+
+class SpatialHash:
+    """Agrupa objetos por celdas para consultar solo los que pueden solaparse con un rectángulo"""
+    
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+    
+    def clear(self):
+        """Vacía la rejilla"""
+        self.cells.clear()
+        self.count = 0
+    
+    def cell_range(self, rect):
+        """Celdas (x0, x1, y0, y1) que cubre un rectángulo"""
+        size = self.cell_size
+        x0, y0 = rect.left // size, rect.top // size
+        return (x0, max(x0, (rect.right - 1) // size),
+                y0, max(y0, (rect.bottom - 1) // size))
+    
+    def insert(self, obj, rect=None):
+        """Inserta un objeto (por defecto usa obj.rect)"""
+        rect = rect if rect is not None else obj.rect
+        x0, x1, y0, y1 = self.cell_range(rect)
+        entry = (self.count, obj)
+        self.count += 1
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(entry)
+    
+    def rebuild(self, objects):
+        """Reconstruye la rejilla con las posiciones actuales"""
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+    
+    def query(self, rect):
+        """Objetos en las celdas del rectángulo, sin duplicados y en orden de inserción"""
+        x0, x1, y0, y1 = self.cell_range(rect)
+        if x0 == x1 and y0 == y1:
+            entries = self.cells.get((x0, y0))
+            return [obj for _, obj in entries] if entries else []
+        
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for index, obj in self.cells.get((cx, cy), ()):
+                    found[index] = obj
+        return [found[index] for index in sorted(found)]
+    
+    def query_colliding(self, rect):
+        """Objetos cuyo rect colisiona con el rectángulo (fase estrecha incluida)"""
+        return [obj for obj in self.query(rect) if rect.colliderect(obj.rect)]
@@ -0,0 +1,91 @@
+"""
+Arranque por etapas: módulos que se importan al usarse y medición de tiempos de inicio
+"""
+
+import importlib
+import threading
+import time
+
+class LazyModule:
+    """Módulo que se importa la primera vez que se usa uno de sus atributos
+    
+    import_module usa los candados de importación, así que es seguro usarlo desde
+    varios hilos (por ejemplo el hilo de Firebase y el de precarga).
+    """
+    
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+    
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+def warm_up_imports(names, background=True):
+    """Importa módulos pesados por adelantado; en segundo plano retorna el hilo"""
+    def worker():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"No se pudo precargar {name}: {e}")
+    
+    if not background:
+        worker()
+        return None
+    thread = threading.Thread(target=worker, name="ImportWarmUp", daemon=True)
+    thread.start()
+    return thread
+
+class StartupTimer:
+    """Tiempo de cada etapa del arranque hasta el primer frame dibujado"""
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []
+        self.enabled = False
+        self.finished = False
+    
+    def phase(self, name):
+        """Contexto que mide una etapa: with startup_timer.phase("sonido"): ..."""
+        return _Phase(self, name)
+    
+    def record(self, name, seconds):
+        """Añade una etapa medida por fuera"""
+        self.phases.append((name, seconds))
+    
+    def finish(self):
+        """Marca el primer frame en pantalla; imprime el informe si se pidió (solo la primera vez)"""
+        if self.finished:
+            return
+        self.finished = True
+        self.total = time.perf_counter() - self.start
+        if self.enabled:
+            self.report()
+    
+    def report(self):
+        """Imprime el desglose por etapas"""
+        print("Tiempos de arranque:")
+        for name, seconds in self.phases:
+            print(f"  {name:<28} {seconds * 1000:8.1f} ms")
+        accounted = sum(seconds for _, seconds in self.phases)
+        print(f"  {'(sin medir)':<28} {(self.total - accounted) * 1000:8.1f} ms")
+        print(f"  {'total hasta el primer frame':<28} {self.total * 1000:8.1f} ms")
+
+class _Phase:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+# Temporizador del proceso (empieza al importar este módulo, lo antes posible desde main.py)
+startup_timer = StartupTimer()
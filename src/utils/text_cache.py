@@ -0,0 +1,69 @@
+"""
+Registro de fuentes compartidas y caché de textos renderizados
+"""
+
+import threading
+from collections import OrderedDict
+import pygame
+
+# Máximo de superficies de texto en caché (las menos usadas se descartan)
+MAX_CACHED_TEXTS = 512
+
+_fonts = {}
+_texts = OrderedDict()
+_text_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+class CachedFont:
+    """Fuente que solo rasteriza un texto cuando cambia su contenido, color o fondo
+    
+    Se usa igual que pygame.font.Font; el resto de métodos se delegan a la fuente real.
+    Las superficies retornadas son compartidas: no deben modificarse.
+    """
+    
+    def __init__(self, name, size):
+        self.key = (name, size)
+        self.font = pygame.font.Font(name, size)
+    
+    def render(self, text, antialias, color, background=None):
+        """Superficie del texto (de la caché si ya se dibujó antes)"""
+        key = (self.key, text, antialias, tuple(color), tuple(background) if background is not None else None)
+        with _text_lock:
+            surface = _texts.get(key)
+            if surface is not None:
+                _texts.move_to_end(key)
+                _stats['hits'] += 1
+                return surface
+        
+        if background is None:
+            surface = self.font.render(text, antialias, color)
+        else:
+            surface = self.font.render(text, antialias, color, background)
+        
+        with _text_lock:
+            _stats['misses'] += 1
+            _texts[key] = surface
+            if len(_texts) > MAX_CACHED_TEXTS:
+                _texts.popitem(last=False)
+        return surface
+    
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+def get_font(size, name=None):
+    """Fuente compartida por (nombre, tamaño); se crea una sola vez"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = CachedFont(name, size)
+    return font
+
+def get_text_cache_stats():
+    """Estadísticas de la caché de textos"""
+    with _text_lock:
+        return {'texts': len(_texts), 'hits': _stats['hits'], 'misses': _stats['misses']}
+
+def clear_text_cache():
+    """Vacía la caché de textos (las fuentes se conservan)"""
+    with _text_lock:
+        _texts.clear()
@@ -0,0 +1,14 @@
+"""
+Configuración común de las pruebas: pygame sin ventana y raíz del proyecto en el path
+"""
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Los recursos (sprites, modelos) usan rutas relativas a la raíz
+os.chdir(ROOT)
@@ -0,0 +1,57 @@
+"""
+Pruebas de la caché del ranking global
+"""
+
+from concurrent.futures import Future
+from src.utils.config import Config
+from src.managers.leaderboard_cache import LeaderboardCache
+
+class FakeFirebaseManager:
+    """Firebase síncrono en memoria que cuenta las peticiones"""
+    
+    def __init__(self, scores):
+        self.scores = scores
+        self.last_score_update = 0.0
+        self.requests = 0
+    
+    def submit(self, func, *args, callback=None):
+        future = Future()
+        future.set_result(func(*args))
+        if callback:
+            callback(future)
+        return future
+    
+    def fetch_leaderboard_page(self, page_size):
+        self.requests += 1
+        ordered = sorted(self.scores.items(), key=lambda item: item[1], reverse=True)[:page_size]
+        return [{'uid': uid, 'score': score} for uid, score in ordered], None
+    
+    def fetch_user_rank(self, user_id, score=None):
+        self.requests += 1
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        above = sum(1 for other in self.scores.values() if other > score)
+        return {'rank': above + 1, 'score': score, 'capped': False}
+
+def test_player_without_score_waits_for_ttl(tmp_path):
+    """Un jugador sin puntuación no fuerza una descarga cada vez que abre el ranking"""
+    firebase_manager = FakeFirebaseManager({'a': 100, 'b': 50})
+    cache = LeaderboardCache(Config(), firebase_manager, str(tmp_path / "leaderboard.json"))
+    
+    cache.revalidate('newcomer')
+    assert firebase_manager.requests == 2
+    assert 'newcomer' in cache.ranks
+    assert cache.get_rank('newcomer') is None
+    
+    # Dentro del TTL no hay más peticiones
+    assert not cache.is_stale('newcomer')
+    cache.revalidate('newcomer')
+    assert firebase_manager.requests == 2
+    
+    # La marca "sin posición" se conserva en disco
+    reloaded = LeaderboardCache(Config(), firebase_manager, str(tmp_path / "leaderboard.json"))
+    assert not reloaded.is_stale('newcomer')
+    
+    # Otro jugador sí necesita su posición
+    assert cache.is_stale('b')
@@ -0,0 +1,60 @@
+"""
+Pruebas del grafo de navegación y del seguimiento de rutas de los enemigos
+"""
+
+import random
+import pygame
+from src.ai.navigation import DROP, JUMP
+from src.utils.config import Config
+from src.game.level import Level
+from src.entities.enemy import Enemy, max_jump_height
+from src.managers.entity_manager import EntityManager
+
+def test_barrel_follows_drop_edge_to_lower_platform():
+    """Un barril cuya ruta baja por una arista DROP cae y aterriza en la plataforma inferior"""
+    random.seed(1)
+    config = Config()
+    level = Level(config)
+    manager = EntityManager(config)
+    barrel = Enemy(300, 425, config, "barrel")
+    manager.enemies.append(barrel)
+    player_rect = pygame.Rect(20, 510, 30, 40)  # En el suelo, bajo la plataforma 1
+    platform_index = level.get_platform_index()
+    
+    # La ruta hacia el jugador pasa por una arista DROP
+    graph = level.get_navigation_graph()
+    start = graph.nearest_node(barrel.rect.centerx, 450)
+    nodes = graph.find_node_path(start, graph.nearest_node(player_rect.centerx, player_rect.bottom))
+    edge_types = [graph.edge_type(a, b) for a, b in zip([start] + nodes, nodes)]
+    assert DROP in edge_types
+    
+    for _ in range(600):
+        manager.update_navigation(level, player_rect)
+        barrel.update(player_rect, level.platforms, None, None, platform_index)
+        if barrel.rect.bottom == 550:
+            break
+    assert barrel.rect.bottom == 550
+    assert barrel.on_ground
+
+def test_monster_graph_only_has_reachable_jumps():
+    """El grafo de los monstruos no tiene saltos más altos de lo que alcanza su impulso"""
+    config = Config()
+    level = Level(config)
+    barrel_graph = level.get_navigation_graph(max_jump_height("barrel"))
+    monster_graph = level.get_navigation_graph(max_jump_height("monster"))
+    assert monster_graph is not barrel_graph
+    
+    def jump_rises(graph):
+        return [graph.node_y[node] - graph.node_y[target]
+                for node in range(len(graph.node_x))
+                for target, _, edge_type in graph.neighbors(node) if edge_type == JUMP]
+    
+    # En el nivel 1 las plataformas están a 100 px: el barril las alcanza, el monstruo no
+    assert max(jump_rises(barrel_graph)) == 100
+    assert all(rise <= max_jump_height("monster") for rise in jump_rises(monster_graph))
+    assert not jump_rises(monster_graph)
+    
+    # Sin camino hacia la plataforma superior el monstruo no recibe pasos de salto
+    flow_field = level.get_flow_field(max_jump_height("monster"))
+    flow_field.update((400, 450))
+    assert flow_field.next_step((400, 550)) is None
@@ -0,0 +1,50 @@
+"""
+Pruebas de carga de modelos Q-Learning (checkpoint binario y .pkl)
+"""
+
+import os
+import pickle
+from src.ai.q_learning import QLearningAgent
+from src.ai.checkpoint import CheckpointWriter
+
+STATE_KEY = (5, 5, 5, 5, 10, 10)
+
+def write_checkpoint_with(model_path, q_value):
+    """Crea un agente, fija un valor Q y lo guarda solo en el checkpoint binario"""
+    agent = QLearningAgent(6, 4, model_path=model_path)
+    agent.q_table[STATE_KEY] = [q_value, 0.0, 0.0, 0.0]
+    agent.mark_all_dirty()
+    writer = CheckpointWriter()
+    writer.request(agent)
+    writer.close()
+
+def write_pickle_with(model_path, q_value):
+    """Escribe un modelo .pkl con un único estado"""
+    with open(model_path, 'wb') as f:
+        pickle.dump({'q_table': {STATE_KEY: [q_value, 0.0, 0.0, 0.0]}, 'epsilon': 0.1}, f)
+
+def set_mtime(path, seconds):
+    os.utime(path, (seconds, seconds))
+
+def test_newer_pickle_replaces_older_checkpoint(tmp_path):
+    """Un .pkl más nuevo que el checkpoint local se carga y el checkpoint antiguo se descarta"""
+    model_path = str(tmp_path / "model.pkl")
+    write_checkpoint_with(model_path, 1.0)
+    write_pickle_with(model_path, 2.0)
+    set_mtime(model_path.replace('.pkl', '.qtbl'), 1000)
+    set_mtime(model_path, 2000)
+    
+    agent = QLearningAgent(6, 4, model_path=model_path)
+    assert agent.q_table[STATE_KEY][0] == 2.0
+    assert not os.path.exists(agent.checkpoint_path)
+
+def test_newer_checkpoint_is_preferred(tmp_path):
+    """Un checkpoint más nuevo que el .pkl se carga en su lugar"""
+    model_path = str(tmp_path / "model.pkl")
+    write_pickle_with(model_path, 2.0)
+    write_checkpoint_with(model_path, 1.0)
+    set_mtime(model_path, 1000)
+    set_mtime(model_path.replace('.pkl', '.qtbl'), 2000)
+    
+    agent = QLearningAgent(6, 4, model_path=model_path)
+    assert agent.q_table[STATE_KEY][0] == 1.0
@@ -0,0 +1,25 @@
+"""
+Pruebas del entrenamiento sin ventana
+"""
+
+from src.utils.config import Config
+from src.game.simulation import train_parallel
+from src.ai.q_learning import clear_shared_agents, get_shared_agents
+
+def test_train_parallel_with_default_config(monkeypatch):
+    """El entrenamiento en paralelo funciona con la configuración por defecto (tabla de diccionario)"""
+    monkeypatch.delenv('DENSE_Q_TABLE', raising=False)
+    config = Config()
+    assert not config.DENSE_Q_TABLE
+    
+    clear_shared_agents()
+    try:
+        stats = train_parallel(config, rounds=1, workers=2, episodes_per_round=1, max_ticks=30,
+                               levels=[1], seed=0)
+        assert stats['episodes'] == 2
+        assert stats['ticks'] > 0
+        assert get_shared_agents()['barrel'].dense
+        # La configuración del juego no cambia
+        assert not config.DENSE_Q_TABLE
+    finally:
+        clear_shared_agents()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Entrenamiento sin ventana de la IA de los barriles
+Ejecuta episodios simulados sin límite de FPS y guarda el modelo Q-Learning
+"""
+
+import os
+import sys
+import argparse
+
+# Sin ventana ni audio
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from src.utils.config import Config
+from src.game.simulation import train, train_parallel, POLICIES
+from src.ai.checkpoint import CheckpointWriter
+from src.ai.q_learning import get_shared_agents
+
+def main():
+    """Función principal del entrenamiento"""
+    parser = argparse.ArgumentParser(description="Entrena la IA de los barriles sin ventana")
+    parser.add_argument('--episodes', type=int, default=100, help="Número de episodios")
+    parser.add_argument('--max-ticks', type=int, default=3600, help="Frames máximos por episodio")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='random', help="Política del jugador")
+    parser.add_argument('--levels', type=int, nargs='+', default=None,
+                        help="Niveles a simular (por defecto 1-3, o 1-13 en paralelo)")
+    parser.add_argument('--seed', type=int, default=None, help="Semilla aleatoria")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Procesos en paralelo (0 = uno por núcleo)")
+    parser.add_argument('--rounds', type=int, default=10,
+                        help="Rondas de combinación de tablas Q en modo paralelo")
+    args = parser.parse_args()
+    
+    config = Config()
+    if args.workers == 1:
+        stats = train(config, args.episodes, args.max_ticks, args.policy, args.levels or [1, 2, 3], args.seed)
+    else:
+        # Los episodios se reparten entre rondas y procesos
+        workers = args.workers or os.cpu_count() or 1
+        episodes_per_round = max(1, args.episodes // (args.rounds * workers))
+        stats = train_parallel(config, args.rounds, workers, episodes_per_round, args.max_ticks,
+                               args.policy, args.levels, args.seed or 0)
+    print(f"{stats['episodes']} episodios, {stats['ticks']} frames en {stats['seconds']:.1f}s "
+          f"({stats['ticks_per_second']:.0f} frames/s)")
+    
+    # Guardar el modelo entrenado (pickle y checkpoint binario completo)
+    writer = CheckpointWriter()
+    for agent in get_shared_agents().values():
+        agent.save_model()
+        agent.mark_all_dirty()
+        writer.request(agent)
+        print(agent.get_stats())
+    writer.close()
+
+if __name__ == "__main__":
+    sys.exit(main())